@@ -3,6 +3,7 @@ import shutil
 import os
 from pathlib import Path
 import sys
+from src.level_bundle import BUNDLE_NAME, build_bundle
 
 def build_executable():
     """Build the game executable using PyInstaller."""
@@ -63,6 +64,9 @@ def build_executable():
     if levels_source.exists():
         shutil.copytree(levels_source, levels_dest, dirs_exist_ok=True)
         print(f"✓ Copied levels folder")
+        # Pack the levels so the game loads one mapped file instead of scanning JSON
+        count = build_bundle(levels_source, levels_dest / BUNDLE_NAME)
+        print(f"✓ Packed {count} levels into {BUNDLE_NAME}")
     else:
         print("✗ WARNING: levels folder not found!")
     
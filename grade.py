@@ -0,0 +1,7 @@
+"""Headless batch grader for Mission: Pythonic submissions (no pygame needed)."""
+import sys
+
+from src.batch_grader import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,9 @@
 """Main entry point for Mission: Pythonic."""
-from src.game import main
+import multiprocessing
 
 if __name__ == "__main__":
+    # Needed for the evaluation worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    # Imported here so worker processes re-importing this module don't load pygame
+    from src.game import main
     main()
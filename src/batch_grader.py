@@ -0,0 +1,197 @@
+"""Headless batch grading of saved submissions (never imports pygame)."""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+from .code_evaluator import CodeEvaluator
+from .level_loader import LevelLoader
+from .sandbox import ProcessPoolBackend
+
+
+def imap_ordered(executor, func: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Map func over items on an executor, yielding results in input order.
+
+    At most `window` items are in flight, so results stream out while the
+    input is still being read.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def imap_unordered(executor, func: Callable, items: Iterable, window: int) -> Iterator[Tuple[int, Any]]:
+    """
+    Map func over items on an executor, yielding (index, result) as each finishes.
+
+    At most `window` items are in flight, so results stream out while the
+    input is still being read, and a slow item never holds back the ones
+    submitted after it.
+    """
+    pending = {}
+    for index, item in enumerate(items):
+        pending[executor.submit(func, item)] = index
+        if len(pending) >= window:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    for future in as_completed(pending):
+        yield pending[future], future.result()
+
+
+def _read_records_file(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield submission records from a .jsonl or .json file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Error reading {path.name}:{line_no}: {e}", file=sys.stderr)
+        else:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                print(f"Error reading {path.name}: {e}", file=sys.stderr)
+                return
+            if isinstance(data, list):
+                yield from data
+            else:
+                yield data
+
+
+def read_records(source: Path) -> Iterator[Dict[str, Any]]:
+    """Yield (player, level_id, code) records from a JSONL file or a directory of record files."""
+    if source.is_dir():
+        files = sorted(list(source.glob("*.jsonl")) + list(source.glob("*.json")))
+    else:
+        files = [source]
+    for path in files:
+        yield from _read_records_file(path)
+
+
+class BatchGrader:
+    """Grades submission records against the level pack."""
+
+    def __init__(self, levels_dir: Path, workers: int, timeout: float):
+        self.level_loader = LevelLoader(levels_dir)
+        self.workers = workers
+        self.backend = ProcessPoolBackend(workers=workers, timeout=timeout)
+        # Records already keep every worker busy, and serial test cases keep a
+        # record's runs on its own thread so its worker wait time can be measured
+        self.evaluator = CodeEvaluator(backend=self.backend, parallel_tests=False)
+
+    def grade_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Grade one record and return its verdict line.
+
+        Malformed records and evaluation errors become failed verdicts, so one
+        bad record never stops the rest of the batch. elapsed_ms leaves out
+        time spent waiting for a free worker.
+        """
+        start = time.perf_counter()
+        waited = self.backend.wait_time()
+        if not isinstance(record, dict):
+            player, level_id = "", ""
+            success, message = False, f"Record is not an object: {type(record).__name__}"
+        else:
+            player = record.get("player", "")
+            level_id = record.get("level_id", "")
+            try:
+                success, message = self._evaluate_record(record, level_id)
+            except Exception as e:
+                success, message = False, f"Error: {type(e).__name__}: {e}"
+
+        return {
+            "player": player,
+            "level_id": level_id,
+            "success": success,
+            "message": message,
+            "elapsed_ms": round((time.perf_counter() - start - (self.backend.wait_time() - waited)) * 1000, 3),
+        }
+
+    def _evaluate_record(self, record: Dict[str, Any], level_id: Any) -> Tuple[bool, str]:
+        """Look up the record's level and evaluate its code against it."""
+        level = self.level_loader.get_level(level_id) if isinstance(level_id, str) else None
+        if level is None:
+            return False, f"Unknown level: {level_id}"
+        if not isinstance(record.get("code"), str):
+            return False, "Record has no code"
+        return self.evaluator.evaluate_level(record["code"], level)
+
+    def grade(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Grade records across all workers, yielding verdicts as they finish.
+
+        Each verdict's "index" is the record's position in the input.
+        """
+        # Extra dispatch threads keep every worker busy while results are collected
+        with ThreadPoolExecutor(max_workers=self.workers * 2) as executor:
+            for index, verdict in imap_unordered(executor, self.grade_record, records, window=self.workers * 8):
+                yield {"index": index, **verdict}
+
+    def shutdown(self):
+        """Stop the evaluation workers."""
+        self.evaluator.shutdown()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(
+        description="Grade saved Mission: Pythonic submissions without starting the game."
+    )
+    parser.add_argument("source", type=Path,
+                        help="JSONL file or directory of .json/.jsonl files with player, level_id and code")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="Write verdicts as JSONL here (default: stdout)")
+    parser.add_argument("--levels", type=Path, default=base_dir / "levels",
+                        help="Levels directory (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of evaluation worker processes (default: all cores)")
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="Wall-clock limit per run in seconds (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not args.source.exists():
+        parser.error(f"{args.source} does not exist")
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    graded = passed = 0
+    # Level loader and sandbox warnings are printed; keep them out of the verdict stream
+    with contextlib.redirect_stdout(sys.stderr):
+        grader = BatchGrader(args.levels, max(1, args.workers), args.timeout)
+        try:
+            for verdict in grader.grade(read_records(args.source)):
+                out.write(json.dumps(verdict) + "\n")
+                out.flush()
+                graded += 1
+                passed += verdict["success"]
+        finally:
+            grader.shutdown()
+            if args.output:
+                out.close()
+
+    elapsed = time.perf_counter() - start
+    rate = graded / elapsed * 60 if elapsed > 0 else 0
+    print(f"Graded {graded} submissions ({passed} passed) in {elapsed:.2f}s "
+          f"- {rate:.0f} submissions/minute", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,515 @@
+"""
+Output checkers, compiled once from a level's checker config.
+
+Each checker type is a Checker subclass registered under its JSON "type"
+name. compile_checker validates a config and builds the checker when the
+level is loaded, so judging a submission is a single check() call. Types
+that can reject output while it is still being printed also provide an
+incremental stream (the *Stream classes). Streams only ever stop a run
+early to fail it: a pass needs the program to finish without an error,
+after which the stream's finish() may give the verdict without check().
+"""
+import csv
+import io
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Type
+
+
+class LinesStream:
+    """output_lines: fails as soon as a non-blank line differs from the expected one."""
+
+    def __init__(self, expected: List[str]):
+        self.expected = expected
+        self._index = 0
+        self._partial = ""
+
+    def feed(self, chunk: str) -> Optional[bool]:
+        """Consume an output chunk; returns False on the first mismatching line."""
+        if "\n" not in chunk:
+            self._partial += chunk
+            return None
+
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if self._index >= len(self.expected) or line != self.expected[self._index]:
+                return False
+            self._index += 1
+        return None
+
+    def finish(self) -> Optional[bool]:
+        """Verdict for a run that ended cleanly; None leaves it to check()."""
+        return None
+
+
+class UnorderedLinesStream:
+    """output_lines_unordered: fails as soon as a line isn't among the remaining expected ones."""
+
+    def __init__(self, expected: Counter):
+        self.remaining = Counter(expected)
+        self._partial = ""
+
+    def feed(self, chunk: str) -> Optional[bool]:
+        """Consume an output chunk; returns False on the first unexpected line."""
+        if "\n" not in chunk:
+            self._partial += chunk
+            return None
+
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if self.remaining[line] <= 0:
+                return False
+            self.remaining[line] -= 1
+        return None
+
+    def finish(self) -> Optional[bool]:
+        """Verdict for a run that ended cleanly; None leaves it to check()."""
+        return None
+
+
+class ContainsStream:
+    """
+    output_contains: records whether the expected text has been printed.
+
+    Only each new chunk is case-folded, together with the last
+    len(expected) - 1 characters seen, so a match split across chunks is
+    still found. Never stops the run; the finding is the verdict once the
+    run ends cleanly.
+    """
+
+    def __init__(self, expected: str, case_sensitive: bool):
+        self.expected = expected
+        self.case_sensitive = case_sensitive
+        self.found = not expected
+        self._tail = ""
+
+    def feed(self, chunk: str) -> Optional[bool]:
+        """Consume an output chunk; never returns a verdict."""
+        if not self.found:
+            text = self._tail + (chunk if self.case_sensitive else chunk.lower())
+            if self.expected in text:
+                self.found = True
+                self._tail = ""
+            else:
+                keep = len(self.expected) - 1
+                self._tail = text[-keep:] if keep else ""
+        return None
+
+    def finish(self) -> Optional[bool]:
+        """Verdict for a run that ended cleanly: whether the text was printed."""
+        return self.found
+
+
+def describe_type_error(name: str, value: Any, expected) -> Optional[str]:
+    """Describe a type mismatch, or None if the value has an accepted type."""
+    # bool is an int subclass but never a sensible count or bound
+    if isinstance(value, expected) and not (isinstance(value, bool) and expected is not bool):
+        return None
+    names = expected if isinstance(expected, tuple) else (expected,)
+    allowed = " or ".join("null" if t is type(None) else t.__name__ for t in names)
+    return f"'{name}' should be {allowed}, got {type(value).__name__}"
+
+
+class TestCase:
+    """
+    One run of a submission and how to judge it.
+
+    files of None means the level's own requires_file; label is None for a
+    level's single plain run, otherwise something like "Test 2".
+    """
+
+    __slots__ = ("checker", "modification", "presets", "stdin", "files", "label", "expected", "seed")
+
+    def __init__(self, checker: "Checker", modification: Optional[str] = None,
+                 presets: Optional[Dict[str, Any]] = None, stdin: Optional[str] = None,
+                 files: Any = None, label: Optional[str] = None, expected: Optional[str] = None,
+                 seed: Any = None):
+        self.checker = checker
+        self.modification = modification
+        self.presets = presets
+        self.stdin = stdin
+        self.files = files
+        self.label = label
+        self.expected = expected
+        # Overrides the seed derived from the level's random_seed and the test index
+        self.seed = seed
+
+
+CHECKERS: Dict[str, Type["Checker"]] = {}
+
+
+def register_checker(cls: Type["Checker"]) -> Type["Checker"]:
+    """Class decorator adding a checker type to the registry under its type_name."""
+    CHECKERS[cls.type_name] = cls
+    return cls
+
+
+class Checker:
+    """
+    Base class for checker types.
+
+    Subclasses set type_name and FIELDS (required config keys and their
+    types), read the config once in __init__, and implement check().
+    """
+
+    type_name = ""
+    FIELDS: Dict[str, Any] = {}
+
+    def __init__(self, config: Dict[str, Any]):
+        pass
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        """Check a config has the fields this type needs; returns a list of problems."""
+        errors = []
+        for name, expected in cls.FIELDS.items():
+            if name not in config:
+                errors.append(f"checker is missing '{name}'")
+                continue
+            error = describe_type_error(f"checker.{name}", config[name], expected)
+            if error:
+                errors.append(error)
+        return errors
+
+    def check(self, output: str) -> bool:
+        """Judge the complete (stripped) output of a successful run."""
+        raise NotImplementedError
+
+    def test_cases(self) -> List["TestCase"]:
+        """Get the runs a submission must pass: a single plain run unless overridden."""
+        return [TestCase(self)]
+
+    def stream(self):
+        """
+        Build a fresh incremental checker for one run.
+
+        Returns:
+            An object with feed(chunk) -> Optional[bool] returning False once
+            the output can no longer pass and finish() -> Optional[bool]
+            giving the verdict (or None) after a clean exit, or None if this
+            checker can only judge the complete output
+        """
+        return None
+
+
+@register_checker
+class ContainsChecker(Checker):
+    """Passes when the output contains the expected text."""
+
+    type_name = "output_contains"
+    FIELDS = {"expected": str}
+
+    def __init__(self, config: Dict[str, Any]):
+        self.expected = config["expected"]
+        self.case_sensitive = config.get("case_sensitive", False)
+        self._folded = self.expected if self.case_sensitive else self.expected.lower()
+
+    def check(self, output: str) -> bool:
+        return self._folded in (output if self.case_sensitive else output.lower())
+
+    def stream(self):
+        # check() sees stripped output, which can't match expected text with outer whitespace
+        if self.expected != self.expected.strip():
+            return None
+        return ContainsStream(self._folded, self.case_sensitive)
+
+
+@register_checker
+class LinesChecker(Checker):
+    """Passes when the non-blank output lines equal the expected lines."""
+
+    type_name = "output_lines"
+    FIELDS = {"expected": list}
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        errors = super().validate(config)
+        if isinstance(config.get("expected"), list) and not all(
+            isinstance(line, str) for line in config["expected"]
+        ):
+            errors.append("'checker.expected' lines should all be str")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        self.expected = list(config["expected"])
+
+    def check(self, output: str) -> bool:
+        return [line.strip() for line in output.split('\n') if line.strip()] == self.expected
+
+    def stream(self):
+        return LinesStream(self.expected)
+
+
+@register_checker
+class RangeChecker(Checker):
+    """Passes when the output is a single integer within [min, max]."""
+
+    type_name = "output_range"
+    FIELDS = {"min": (int, float), "max": (int, float)}
+
+    def __init__(self, config: Dict[str, Any]):
+        self.min = config["min"]
+        self.max = config["max"]
+
+    def check(self, output: str) -> bool:
+        try:
+            return self.min <= int(output.strip()) <= self.max
+        except ValueError:
+            return False
+
+
+@register_checker
+class UnorderedLinesChecker(LinesChecker):
+    """Passes when the non-blank output lines are the expected lines in any order."""
+
+    type_name = "output_lines_unordered"
+
+    def __init__(self, config: Dict[str, Any]):
+        self.expected = Counter(config["expected"])
+
+    def check(self, output: str) -> bool:
+        return Counter(line.strip() for line in output.split('\n') if line.strip()) == self.expected
+
+    def stream(self):
+        return UnorderedLinesStream(self.expected)
+
+
+@register_checker
+class RegexChecker(Checker):
+    """
+    Passes when the output matches a regular expression.
+
+    By default the pattern may match anywhere ("mode": "search"); use
+    "mode": "fullmatch" to require it to match the whole output.
+    """
+
+    type_name = "output_regex"
+    FIELDS = {"pattern": str}
+    MODES = ("search", "fullmatch")
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        errors = super().validate(config)
+        if config.get("mode", "search") not in cls.MODES:
+            errors.append(f"'checker.mode' should be one of {', '.join(cls.MODES)}")
+        if isinstance(config.get("pattern"), str):
+            try:
+                re.compile(config["pattern"])
+            except re.error as e:
+                errors.append(f"'checker.pattern' is not a valid regex: {e}")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        flags = re.MULTILINE
+        if not config.get("case_sensitive", True):
+            flags |= re.IGNORECASE
+        self.pattern = re.compile(config["pattern"], flags)
+        self._match = self.pattern.fullmatch if config.get("mode") == "fullmatch" else self.pattern.search
+
+    def check(self, output: str) -> bool:
+        return self._match(output) is not None
+
+
+@register_checker
+class FloatChecker(Checker):
+    """Passes when the output is a single number close to the expected value."""
+
+    type_name = "output_float"
+    FIELDS = {"expected": (int, float)}
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        errors = super().validate(config)
+        for name in ("abs_tol", "rel_tol"):
+            if name not in config:
+                continue
+            error = describe_type_error(f"checker.{name}", config[name], (int, float))
+            if error:
+                errors.append(error)
+            elif config[name] < 0:
+                errors.append(f"'checker.{name}' should not be negative")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        self.expected = float(config["expected"])
+        self.abs_tol = float(config.get("abs_tol", 1e-6))
+        self.rel_tol = float(config.get("rel_tol", 0.0))
+
+    def check(self, output: str) -> bool:
+        try:
+            value = float(output.strip())
+        except ValueError:
+            return False
+        return math.isclose(value, self.expected, rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+
+
+@register_checker
+class JsonChecker(Checker):
+    """Passes when the output parses as JSON equal to the expected value (key order ignored)."""
+
+    type_name = "output_json"
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        errors = super().validate(config)
+        if "expected" not in config:
+            errors.append("checker is missing 'expected'")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        self.expected = config["expected"]
+
+    def check(self, output: str) -> bool:
+        try:
+            return json.loads(output) == self.expected
+        except ValueError:
+            return False
+
+
+@register_checker
+class CsvChecker(Checker):
+    """Passes when the output parses as CSV rows equal to the expected rows (cells stripped)."""
+
+    type_name = "output_csv"
+    FIELDS = {"expected": list}
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        errors = super().validate(config)
+        if isinstance(config.get("expected"), list) and not all(
+            isinstance(row, list) for row in config["expected"]
+        ):
+            errors.append("'checker.expected' rows should all be lists")
+        delimiter = config.get("delimiter", ",")
+        if not isinstance(delimiter, str) or len(delimiter) != 1:
+            errors.append("'checker.delimiter' should be a single character")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        self.delimiter = config.get("delimiter", ",")
+        # Expected cells may be written as numbers; compare everything as text
+        self.expected = [[str(cell).strip() for cell in row] for row in config["expected"]]
+
+    def check(self, output: str) -> bool:
+        try:
+            rows = [[cell.strip() for cell in row]
+                    for row in csv.reader(io.StringIO(output), delimiter=self.delimiter)]
+        except csv.Error:
+            return False
+        return [row for row in rows if any(row)] == self.expected
+
+
+@register_checker
+class MultiTestChecker(Checker):
+    """
+    Runs the code once per test case.
+
+    Each test may give a code_modification, namespace presets, stdin text,
+    its own requires_file and a random seed, and is judged either by expected_output
+    (case-insensitive contains) or by a nested checker config of any
+    other type.
+    """
+
+    type_name = "multi_test"
+    FIELDS = {"tests": list}
+    TEST_FIELDS = {
+        "code_modification": str,
+        "expected_output": str,
+        "presets": dict,
+        "stdin": str,
+        "requires_file": (dict, list, type(None)),
+        "seed": (int, str),
+    }
+
+    @classmethod
+    def validate(cls, config: Dict[str, Any]) -> List[str]:
+        # param_injection imports the sandbox, which imports this module
+        from .param_injection import parse_modification
+
+        errors = super().validate(config)
+        tests = config.get("tests")
+        if not isinstance(tests, list):
+            return errors
+        if not tests:
+            errors.append("multi_test checker has no tests")
+        for i, test in enumerate(tests):
+            if not isinstance(test, dict):
+                errors.append(f"test {i+1} should be an object")
+                continue
+            for name, expected in cls.TEST_FIELDS.items():
+                if name in test:
+                    error = describe_type_error(f"tests[{i}].{name}", test[name], expected)
+                    if error:
+                        errors.append(error)
+            if isinstance(test.get("code_modification"), str):
+                try:
+                    parse_modification(test["code_modification"])
+                except ValueError as e:
+                    errors.append(f"test {i+1}: {e}")
+            if "checker" in test:
+                if isinstance(test["checker"], dict) and test["checker"].get("type") == cls.type_name:
+                    errors.append(f"test {i+1} can't nest a multi_test checker")
+                else:
+                    errors.extend(f"test {i+1}: {error}" for error in checker_errors(test["checker"]))
+            elif "expected_output" not in test:
+                errors.append(f"test {i+1} needs 'expected_output' or a 'checker'")
+        return errors
+
+    def __init__(self, config: Dict[str, Any]):
+        self.tests = config["tests"]
+        self.cases = []
+        for i, test in enumerate(self.tests):
+            if "checker" in test:
+                checker = compile_checker(test["checker"])
+            else:
+                checker = ContainsChecker({"expected": test["expected_output"], "case_sensitive": False})
+            self.cases.append(TestCase(
+                checker,
+                modification=test.get("code_modification"),
+                presets=test.get("presets"),
+                stdin=test.get("stdin"),
+                files=test.get("requires_file"),
+                label=f"Test {i+1}",
+                expected=test.get("expected_output"),
+                seed=test.get("seed"),
+            ))
+
+    def check(self, output: str) -> bool:
+        # One output can't show every case passed; CodeEvaluator.check_result runs the cases
+        return False
+
+    def test_cases(self) -> List["TestCase"]:
+        return self.cases
+
+
+def checker_errors(config: Any) -> List[str]:
+    """Validate a checker config against the registry; returns a list of problems."""
+    if not isinstance(config, dict):
+        return ["checker should be an object"]
+    cls = CHECKERS.get(config.get("type"))
+    if cls is None:
+        return [f"unknown checker type {config.get('type')!r}"]
+    return cls.validate(config)
+
+
+def compile_checker(config: Dict[str, Any]) -> Checker:
+    """
+    Build the checker object for a level's checker config.
+
+    Raises:
+        ValueError: If the type is unknown or the config is malformed
+    """
+    errors = checker_errors(config)
+    if errors:
+        raise ValueError(f"invalid checker: {'; '.join(errors)}")
+    return CHECKERS[config["type"]](config)
@@ -1,152 +1,336 @@
 """Evaluate Python code and check against expected results."""
-import io
-import sys
-import contextlib
-import random
-from typing import Dict, Any, Optional, List
+import hashlib
+import threading
+from types import CodeType
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
+from .sandbox import InProcessBackend, TRANSIENT_ERRORS, Code, NamespaceSpec
+from .checkers import Checker, MultiTestChecker, TestCase, compile_checker
+from .eval_cache import CompileCache, VerdictCache
+from .virtual_fs import FixtureSpec
+from .param_injection import ParameterInjector, Variant
 
 
 class EvaluationResult:
     """Result of code evaluation."""
     
-    def __init__(self, success: bool, output: str, error: Optional[str] = None):
+    def __init__(self, success: bool, output: str, error: Optional[str] = None,
+                 verdict: Optional[bool] = None, code: Optional[Code] = None):
         self.success = success
         self.output = output.strip()
         self.error = error
+        # Set when an incremental checker decided pass/fail before the run finished
+        self.verdict = verdict
+        # The code that was run, so multi_test checks can re-run it per test case
+        self.code = code
+
+
+def derive_seed(*parts) -> int:
+    """Turn a level's random_seed (plus e.g. a test index) into a stable 64-bit seed."""
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
 
 
 class CodeEvaluator:
     """Evaluates user code and checks against level requirements."""
     
-    def __init__(self):
-        pass
+    def __init__(self, backend=None, compile_cache_size: int = 256, verdict_cache_size: int = 1024,
+                 seeded_random: bool = True, parallel_tests: bool = True):
+        """
+        Args:
+            backend: Execution backend (defaults to running code in-process)
+            compile_cache_size: Number of compiled submissions to keep
+            verdict_cache_size: Number of deterministic verdicts to keep
+            seeded_random: Seed each run's `random` from the level's random_seed and
+                the test index, making runs reproducible (and cacheable)
+            parallel_tests: Fan a level's test cases out over the backend's workers;
+                turn off when callers already keep every worker busy
+        """
+        self.backend = backend if backend is not None else InProcessBackend()
+        self.seeded_random = seeded_random
+        self.parallel_tests = parallel_tests
+        self.compile_cache = CompileCache(compile_cache_size)
+        self.verdict_cache = VerdictCache(verdict_cache_size, seeded_random)
+        self.injector = ParameterInjector(self.compile_cache)
+        self._job_executor = None
+        self._test_executor = None
+        self._lock = threading.Lock()
     
-    def execute_code(self, code: str, required_file: Optional[Dict] = None) -> EvaluationResult:
+    def execute_code(self, code: Code, required_file: FixtureSpec = None,
+                     presets: Optional[Dict[str, Any]] = None,
+                     on_output: Optional[Callable[[str], None]] = None,
+                     checker: Optional[Checker] = None,
+                     stdin: Optional[str] = None,
+                     namespace_spec: Optional[NamespaceSpec] = None,
+                     seed: Optional[int] = None) -> EvaluationResult:
         """
-        Execute Python code safely and capture output.
+        Execute Python code through the configured backend and capture output.
         
         Args:
-            code: The Python code to execute
-            required_file: Optional dict with 'filename' and 'content' to create before execution
+            code: The Python code to execute (source, or an already compiled code object)
+            required_file: Optional fixture dict (or list of them) with 'filename' and 'content',
+                provided to the code as in-memory files
+            presets: Optional extra names to place in the code's namespace
+            on_output: Optional callback receiving output chunks while the code runs
+            checker: Optional compiled checker used to stop the run early once the output is certain to fail
+            stdin: Optional text for the code's input() calls
+            namespace_spec: Optional level setup (preloaded modules, setup code) for the namespace
+            seed: Optional seed for the run's private `random` module
         
         Returns:
             EvaluationResult with success status, output, and any error
         """
-        # Create temporary file if required
-        if required_file:
+        if isinstance(code, CodeType):
+            compiled = code
+        else:
             try:
-                with open(required_file["filename"], "w", encoding="utf-8") as f:
-                    f.write(required_file["content"])
-            except Exception as e:
-                return EvaluationResult(False, "", f"Error creating file: {e}")
-        
-        # Capture stdout
-        output_buffer = io.StringIO()
-        error_msg = None
-        success = False
-        
-        try:
-            # Execute the code with captured stdout
-            with contextlib.redirect_stdout(output_buffer):
-                # Create a restricted namespace
-                namespace = {
-                    '__builtins__': __builtins__,
-                    'random': random,  # Allow random module
-                }
-                exec(code, namespace)
-            success = True
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {str(e)}"
-        
-        output = output_buffer.getvalue()
-        return EvaluationResult(success, output, error_msg)
+                compiled = self.compile_cache.compile(code)
+            except (SyntaxError, ValueError) as e:
+                return EvaluationResult(False, "", f"{type(e).__name__}: {str(e)}", code=code)
+        
+        success, output, error_msg, verdict = self.backend.execute(
+            compiled, required_file, presets, on_output, checker, stdin, namespace_spec, seed
+        )
+        return EvaluationResult(success, output, error_msg, verdict, code)
+    
+    def shutdown(self):
+        """Release any resources held by the execution backend."""
+        if self._job_executor is not None:
+            self._job_executor.shutdown(wait=False, cancel_futures=True)
+            self._job_executor = None
+        if self._test_executor is not None:
+            self._test_executor.shutdown(wait=False, cancel_futures=True)
+            self._test_executor = None
+        self.backend.shutdown()
     
-    def check_result(self, result: EvaluationResult, checker: Dict[str, Any]) -> bool:
+    def check_result(self, result: EvaluationResult, checker: Union[Checker, Dict[str, Any]],
+                     required_file: FixtureSpec = None,
+                     namespace_spec: Optional[NamespaceSpec] = None,
+                     random_seed: Any = None) -> bool:
         """
         Check if the result matches the expected output.
         
+        A multi_test checker can't be judged from one output, so its test
+        cases are run against result.code.
+        
         Args:
             result: The execution result
-            checker: The checker configuration from level JSON
+            checker: The level's compiled checker (see Level.compiled_checker), or a raw
+                checker config such as Level.checker, which is compiled on each call
+            required_file: The level's fixture files, for multi_test cases
+            namespace_spec: The level's namespace setup, for multi_test cases
+            random_seed: The level's random_seed, for multi_test cases
         
         Returns:
             True if the result passes the check, False otherwise
+        
+        Raises:
+            ValueError: If a raw checker config is malformed
         """
+        if isinstance(checker, dict):
+            checker = compile_checker(checker)
         if not result.success:
             return False
+        if isinstance(checker, MultiTestChecker):
+            if not isinstance(result.code, str):
+                return False
+            failure, _ = self.run_test_cases(result.code, checker.test_cases(), required_file,
+                                             namespace_spec=namespace_spec, random_seed=random_seed)
+            return failure is None
+        return checker.check(result.output)
+    
+    def _run_test(self, variant: Variant, case: TestCase, seed: Optional[int], required_file: FixtureSpec,
+                  namespace_spec: Optional[NamespaceSpec],
+                  on_output: Optional[Callable[[str], None]] = None) -> Tuple[Optional[str], EvaluationResult]:
+        """
+        Run and judge one test case.
         
-        checker_type = checker.get("type")
+        Returns:
+            Tuple of (failure message or None if the test passed, the run's result)
+        """
+        presets = variant.presets
+        if case.presets:
+            presets = {**case.presets, **(presets or {})}
+        files = case.files if case.files is not None else required_file
+        result = self.execute_code(variant.code, files, presets, on_output, case.checker, case.stdin,
+                                   namespace_spec, seed)
         
-        if checker_type == "output_contains":
-            expected = checker["expected"]
-            case_sensitive = checker.get("case_sensitive", False)
-            output = result.output if case_sensitive else result.output.lower()
-            expected = expected if case_sensitive else expected.lower()
-            return expected in output
+        if not result.success:
+            if case.label:
+                return f"{case.label} failed: {result.error}", result
+            return f"Error: {result.error}", result
         
-        elif checker_type == "output_lines":
-            expected_lines = checker["expected"]
-            output_lines = [line.strip() for line in result.output.split('\n') if line.strip()]
-            return output_lines == expected_lines
+        passed = result.verdict if result.verdict is not None else self.check_result(result, case.checker)
+        if passed:
+            return None, result
+        if case.label is None:
+            return f"Output doesn't match expected. Got: {result.output}", result
+        if case.expected is not None:
+            return f"{case.label} failed: Expected '{case.expected}', got '{result.output}'", result
+        return f"{case.label} failed: Output doesn't match expected. Got: {result.output}", result
+    
+    def _run_tests_serial(self, variants: List[Variant], cases: List[TestCase], seeds: List[Optional[int]],
+                          required_file: FixtureSpec,
+                          namespace_spec: Optional[NamespaceSpec],
+                          progress: Optional[Callable[[int, int], None]],
+                          on_output: Optional[Callable[[str], None]]) -> Tuple[Optional[str], List]:
+        """Run test cases one after another, stopping at the first failure."""
+        results = [None] * len(cases)
+        for i, case in enumerate(cases):
+            failure, results[i] = self._run_test(variants[i], case, seeds[i], required_file,
+                                                 namespace_spec, on_output)
+            if failure:
+                return failure, results
+            if progress:
+                progress(i + 1, len(cases))
+        return None, results
+    
+    def _run_tests_parallel(self, variants: List[Variant], cases: List[TestCase], seeds: List[Optional[int]],
+                            required_file: FixtureSpec,
+                            namespace_spec: Optional[NamespaceSpec],
+                            progress: Optional[Callable[[int, int], None]],
+                            on_output: Optional[Callable[[str], None]]) -> Tuple[Optional[str], List]:
+        """
+        Fan test cases out over the backend's workers.
         
-        elif checker_type == "output_range":
-            try:
-                output_num = int(result.output.strip())
-                min_val = checker["min"]
-                max_val = checker["max"]
-                return min_val <= output_num <= max_val
-            except ValueError:
-                return False
+        A failure cancels every later test that hasn't started; earlier tests
+        still finish so the reported failure is always the lowest-numbered one.
+        """
+        with self._lock:
+            if self._test_executor is None:
+                self._test_executor = ThreadPoolExecutor(
+                    max_workers=self.backend.parallelism, thread_name_prefix="evaluator-test"
+                )
+        
+        futures = {
+            self._test_executor.submit(
+                self._run_test, variants[i], case, seeds[i], required_file, namespace_spec, on_output
+            ): i
+            for i, case in enumerate(cases)
+        }
+        results = [None] * len(cases)
+        failures = {}
+        passed = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.cancelled():
+                continue
+            failure, results[index] = future.result()
+            if failure:
+                failures[index] = failure
+                for other, other_index in futures.items():
+                    if other_index > index:
+                        other.cancel()
+            else:
+                passed += 1
+                if progress and not failures:
+                    progress(passed, len(cases))
         
-        elif checker_type == "multi_test":
-            # This requires running multiple test cases
-            # For now, return True if the code executed successfully
-            # This will be handled by the game loop running multiple tests
-            return True
+        if failures:
+            return failures[min(failures)], results
+        return None, results
+    
+    def run_test_cases(self, code: str, cases: List[TestCase], required_file: FixtureSpec = None,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       on_output: Optional[Callable[[str], None]] = None,
+                       namespace_spec: Optional[NamespaceSpec] = None,
+                       random_seed: Any = None
+                       ) -> Tuple[Optional[str], List[Optional[EvaluationResult]]]:
+        """
+        Run a submission through a list of test cases.
+        
+        The code is parsed at most once and compiled once per distinct
+        modification; independent cases run in parallel when the backend
+        has several workers.
+        
+        Args:
+            code: The player's code
+            cases: Test cases, e.g. from a level's compiled_checker.test_cases()
+            required_file: Fixture files for cases that don't bring their own
+            progress: Optional callback receiving (tests_done, tests_total)
+            on_output: Optional callback receiving output chunks while the code runs
+            namespace_spec: Optional level setup, built once per worker and copied per case
+            random_seed: The level's random_seed; each case is seeded from it and its index
+                (or from its own seed) unless seeding is off or it is None
+        
+        Returns:
+            Tuple of (first failure message or None, per-case results; None
+            for cases skipped after a failure)
+        """
+        if any(case.modification for case in cases):
+            # Parse once; every test case reuses the same tree
+            variants = self.injector.variants(code, [case.modification for case in cases])
+        else:
+            variants = [Variant(code, None)] * len(cases)
+        seeds = [None] * len(cases)
+        if self.seeded_random:
+            for i, case in enumerate(cases):
+                if case.seed is not None:
+                    seeds[i] = derive_seed(case.seed)
+                elif random_seed is not None:
+                    seeds[i] = derive_seed(random_seed, i)
         
-        return False
+        if self.parallel_tests and self.backend.parallelism > 1 and len(cases) > 1:
+            return self._run_tests_parallel(variants, cases, seeds, required_file, namespace_spec,
+                                            progress, on_output)
+        return self._run_tests_serial(variants, cases, seeds, required_file, namespace_spec,
+                                      progress, on_output)
     
-    def evaluate_level(self, code: str, level) -> tuple[bool, str]:
+    def submit_level(self, code: str, level,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     on_output: Optional[Callable[[str], None]] = None) -> Future:
+        """
+        Evaluate code for a level on a background thread.
+        
+        See evaluate_level for the callbacks; they are called from worker threads.
+        
+        Returns:
+            Future resolving to the evaluate_level tuple
+        """
+        with self._lock:
+            if self._job_executor is None:
+                self._job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="evaluator")
+        return self._job_executor.submit(self.evaluate_level, code, level, progress, on_output)
+    
+    def evaluate_level(self, code: str, level,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       on_output: Optional[Callable[[str], None]] = None) -> tuple[bool, str]:
         """
         Evaluate code for a specific level.
         
+        Args:
+            code: The player's code
+            level: The level to evaluate against
+            progress: Optional callback receiving (tests_done, tests_total)
+            on_output: Optional callback receiving output chunks while the code runs
+        
         Returns:
             Tuple of (success: bool, message: str)
         """
-        # Handle multi-test cases specially
-        if level.checker.get("type") == "multi_test":
-            tests = level.checker.get("tests", [])
-            for i, test in enumerate(tests):
-                # Replace the security_level line with test value
-                test_code = code
-                if "code_modification" in test:
-                    lines = code.split('\n')
-                    modified_lines = []
-                    for line in lines:
-                        if 'security_level' in line and '=' in line:
-                            modified_lines.append(test["code_modification"])
-                        else:
-                            modified_lines.append(line)
-                    test_code = '\n'.join(modified_lines)
-                
-                result = self.execute_code(test_code, level.requires_file)
-                
-                if not result.success:
-                    return False, f"Test {i+1} failed: {result.error}"
-                
-                expected = test["expected_output"]
-                if expected.lower() not in result.output.lower():
-                    return False, f"Test {i+1} failed: Expected '{expected}', got '{result.output}'"
-            
-            return True, "All tests passed!"
+        # Deterministic code gives the same verdict every time it is run
+        cache_key = self.verdict_cache.key_for(code, level)
+        if cache_key is not None:
+            verdict = self.verdict_cache.get(cache_key)
+            if verdict is not None:
+                return verdict
         
-        # Regular single test
-        result = self.execute_code(code, level.requires_file)
+        verdict = self._evaluate_level(code, level, progress, on_output)
         
-        if not result.success:
-            return False, f"Error: {result.error}"
-        
-        if self.check_result(result, level.checker):
-            return True, f"Success! Output: {result.output}"
-        else:
-            return False, f"Output doesn't match expected. Got: {result.output}"
+        # Timeouts and crashed workers depend on load, so never remember them
+        if cache_key is not None and not any(f"{name}:" in verdict[1] for name in TRANSIENT_ERRORS):
+            self.verdict_cache.put(cache_key, verdict)
+        return verdict
+    
+    def _evaluate_level(self, code: str, level,
+                        progress: Optional[Callable[[int, int], None]],
+                        on_output: Optional[Callable[[str], None]]) -> tuple[bool, str]:
+        """Run a submission against a level, bypassing the verdict cache."""
+        failure, results = self.run_test_cases(
+            code, level.compiled_checker.test_cases(), level.requires_file, progress, on_output,
+            level.namespace_spec, level.random_seed
+        )
+        if failure:
+            return False, failure
+        if isinstance(level.compiled_checker, MultiTestChecker):
+            return True, "All tests passed!"
+        return True, f"Success! Output: {results[0].output}"
@@ -0,0 +1,217 @@
+"""Bounded caches used by the code evaluator."""
+import ast
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def source_hash(source: str) -> str:
+    """Stable hash of a piece of source text."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters."""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (marking it recently used) or default."""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """Drop one entry if it is cached."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CompileCache(LRUCache):
+    """Caches compiled code objects (and compile errors) by source hash."""
+
+    def compile(self, source: str, filename: str = "<string>") -> CodeType:
+        """
+        Compile source, reusing an earlier result for identical text.
+
+        Raises:
+            SyntaxError (or ValueError for null bytes), cached like successes
+        """
+        return self.compile_with(source, lambda: compile(source, filename, "exec"))
+
+    def compile_with(self, key_text: str, build: Callable[[], CodeType]) -> CodeType:
+        """
+        Return the code object cached under key_text, calling build() on a miss.
+
+        Used for code compiled from a transformed AST, where key_text
+        identifies the source plus the transformation applied to it.
+        """
+        key = source_hash(key_text)
+        entry = self.get(key)
+        if entry is None:
+            try:
+                entry = build()
+            except (SyntaxError, ValueError) as e:
+                entry = e
+            self.put(key, entry)
+
+        if isinstance(entry, BaseException):
+            raise entry.with_traceback(None)
+        return entry
+
+
+# Names whose use makes a submission's output depend on more than its source
+# (open and input are safe: they only see the level's in-memory files and stdin text,
+# but modules that read the real disk are not).
+# The dynamic-code and reflection builtins are included because they can reach
+# any of the others through a string the AST check never sees.
+NONDETERMINISTIC_NAMES = frozenset({
+    "random", "time", "datetime", "os", "sys", "uuid",
+    "secrets", "id", "hash", "__import__", "importlib", "subprocess",
+    "socket", "threading",
+    "pathlib", "io", "shutil", "glob", "tempfile", "fileinput", "codecs", "linecache",
+    "eval", "exec", "compile", "getattr", "globals", "locals", "vars", "__builtins__",
+})
+
+
+def normalize_source(source: str) -> str:
+    """Normalize line endings and trailing whitespace without changing meaning."""
+    return source.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+
+
+# Nondeterministic even when `random` is seeded per evaluation
+UNSEEDABLE_NAMES = frozenset({"SystemRandom"})
+# Calls that reseed from system entropy unless given a literal seed
+RESEEDING_CALLS = frozenset({"seed", "Random"})
+
+
+def _is_literal_seed(call: ast.Call) -> bool:
+    """Check that a seed/Random call passes one literal, non-None seed."""
+    args = list(call.args) + [keyword.value for keyword in call.keywords]
+    if len(args) != 1:
+        return False
+    try:
+        return ast.literal_eval(args[0]) is not None
+    except (ValueError, TypeError):
+        return False
+
+
+def is_deterministic(source: str, seeded_random: bool = False) -> bool:
+    """
+    Check that code doesn't reference or import anything nondeterministic.
+
+    With seeded_random, `random` counts as deterministic: every evaluation
+    gets its own Random seeded from the level (see sandbox.random_module).
+    Reseeding it (seed() or Random()) without a literal seed still counts
+    as nondeterministic, since that draws from system entropy.
+    """
+    names = NONDETERMINISTIC_NAMES - {"random"} if seeded_random else NONDETERMINISTIC_NAMES
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return False
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and (node.id in names or node.id in UNSEEDABLE_NAMES):
+            return False
+        if isinstance(node, ast.Attribute) and node.attr in UNSEEDABLE_NAMES:
+            return False
+        if isinstance(node, ast.Call) and not _is_literal_seed(node):
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if name in RESEEDING_CALLS:
+                return False
+        if isinstance(node, ast.Import):
+            if any(alias.name.split(".")[0] in names for alias in node.names):
+                return False
+        if isinstance(node, ast.ImportFrom):
+            if node.module and node.module.split(".")[0] in names:
+                return False
+            if any(alias.name in UNSEEDABLE_NAMES for alias in node.names):
+                return False
+    return True
+
+
+def checker_config_hash(level) -> str:
+    """Hash everything in a level that affects how a submission is judged."""
+    config = {
+        "checker": level.checker,
+        "requires_file": level.requires_file,
+        "preload": level.preload,
+        "setup_code": level.setup_code,
+        "random_seed": level.random_seed,
+    }
+    return source_hash(json.dumps(config, sort_keys=True, default=str))
+
+
+class VerdictCache(LRUCache):
+    """Caches evaluate_level verdicts for deterministic submissions."""
+
+    def __init__(self, maxsize: int = 1024, seeded_random: bool = False):
+        super().__init__(maxsize)
+        # Whether the evaluator seeds `random`, making code that uses it cacheable
+        self.seeded_random = seeded_random
+
+    def key_for(self, code: str, level) -> Optional[Tuple[str, str, str]]:
+        """
+        Build the cache key for a submission.
+
+        Returns:
+            (level id, checker config hash, normalized source hash), or None
+            if the submission must always be re-run
+        """
+        normalized = normalize_source(code)
+        seeded = self.seeded_random and level.random_seed is not None
+        if not is_deterministic(normalized, seeded):
+            return None
+        # Setup helpers run in the submission's namespace, so they count too
+        if level.setup_code and not is_deterministic(level.setup_code, seeded):
+            return None
+        return level.id, checker_config_hash(level), source_hash(normalized)
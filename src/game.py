@@ -1,8 +1,13 @@
 """Main game engine using Pygame."""
+import os
 import pygame
 import pygame_gui
 from pathlib import Path
 from .game_state import GameState, GameScene
+from .matrix_rain import MatrixRain
+from .particles import ParticleSystem
+from .render_cache import GlowTextCache
+from .text_layout import TextLayout
 from .scenes.title_scene import TitleScene
 from .scenes.name_input_scene import NameInputScene
 from .scenes.level_select_scene import LevelSelectScene
@@ -46,6 +51,13 @@ class Game:
         self.game_state = GameState()
         self.running = True
         
+        # Dirty-rect mode: scenes with a draw_background layer only redraw and
+        # push the regions that changed each frame
+        self.dirty_rects = bool(os.environ.get("MISSION_PYTHONIC_DIRTY_RECTS"))
+        self._static_layer = None
+        self._previous_rects = []
+        self._ui_state = {}
+        
         # Scenes
         self.scenes = {
             GameScene.TITLE: TitleScene(self),
@@ -59,10 +71,11 @@ class Game:
         
         # Load font
         self.load_fonts()
+        self.glow_text_cache = GlowTextCache()
+        self.text_layout = TextLayout()
         
         # Particle system
-        self.particles = []
-        self.matrix_chars = []
+        self.particles = ParticleSystem()
         self.init_matrix_rain()
     
     def load_fonts(self):
@@ -74,104 +87,189 @@ class Game:
         self.text_font = pygame.font.SysFont('consolas', 18)
         self.small_font = pygame.font.SysFont('consolas', 14)
     
-    def init_matrix_rain(self):
+    def init_matrix_rain(self, columns=50):
         """Initialize Matrix rain effect."""
-        import random
-        for i in range(50):  # 50 columns of falling text
-            self.matrix_chars.append({
-                'x': random.randint(0, self.SCREEN_WIDTH),
-                'y': random.randint(-self.SCREEN_HEIGHT, 0),
-                'speed': random.randint(2, 8),
-                'char': random.choice('01ABCDEFGHIJKLMNOPQRSTUVWXYZ'),
-                'brightness': random.randint(50, 255)
-            })
+        self.matrix_rain = MatrixRain(self.small_font, self.SCREEN_WIDTH, self.SCREEN_HEIGHT, columns)
     
     def update_matrix_rain(self, dt):
         """Update matrix rain animation."""
-        import random
-        for char_data in self.matrix_chars:
-            char_data['y'] += char_data['speed']
-            if char_data['y'] > self.SCREEN_HEIGHT:
-                char_data['y'] = random.randint(-100, 0)
-                char_data['x'] = random.randint(0, self.SCREEN_WIDTH)
-                char_data['char'] = random.choice('01ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-            # Random brightness flicker
-            if random.random() < 0.1:
-                char_data['brightness'] = random.randint(50, 255)
+        self.matrix_rain.update(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
     
     def draw_matrix_rain(self, screen):
         """Draw animated matrix rain background."""
-        for char_data in self.matrix_chars:
-            brightness = char_data['brightness']
-            color = (0, brightness, 0)
-            text = self.small_font.render(char_data['char'], True, color)
-            screen.blit(text, (char_data['x'], char_data['y']))
+        self.matrix_rain.draw(screen)
     
     def draw_glow_text(self, screen, text, pos, font, color, glow_size=2, center=True):
-        """Draw text with a glow effect."""
-        # Render text to get dimensions
-        main_text = font.render(text, True, color)
+        """
+        Draw text with a glow effect.
+        
+        The glow is composited once per (text, font, color, glow_size) and
+        cached, so redrawing the same text each frame is a single blit.
+        
+        Returns:
+            The screen rect covered by the text and its glow
+        """
+        surface = self.glow_text_cache.render(text, font, color, glow_size)
         
         # Calculate position (center if requested)
         if center:
-            text_rect = main_text.get_rect(center=pos)
-            draw_pos = text_rect.topleft
+            rect = surface.get_rect(center=pos)
         else:
-            draw_pos = pos
-        
-        # Draw glow (darker version)
-        glow_color = (color[0] // 3, color[1] // 3, color[2] // 3)
-        for offset_x in range(-glow_size, glow_size + 1):
-            for offset_y in range(-glow_size, glow_size + 1):
-                if offset_x != 0 or offset_y != 0:
-                    glow_text = font.render(text, True, glow_color)
-                    screen.blit(glow_text, (draw_pos[0] + offset_x, draw_pos[1] + offset_y))
-        # Draw main text
-        screen.blit(main_text, draw_pos)
+            rect = surface.get_rect(topleft=(pos[0] - glow_size, pos[1] - glow_size))
+        return screen.blit(surface, rect)
     
     def spawn_particles(self, x, y, count=20, color=None):
         """Spawn particles at a position."""
-        import random
         if color is None:
             color = self.GREEN
-        for _ in range(count):
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-3, 3),
-                'vy': random.uniform(-3, 3),
-                'life': 1.0,
-                'color': color
-            })
+        self.particles.spawn(x, y, count, color)
     
     def update_particles(self, dt):
         """Update particle effects."""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.2  # Gravity
-            particle['life'] -= dt * 2
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        self.particles.update(dt)
     
     def draw_particles(self, screen):
         """Draw particle effects."""
-        for particle in self.particles:
-            alpha = int(particle['life'] * 255)
-            color = (*particle['color'], alpha)
-            size = max(1, int(particle['life'] * 4))
-            pos = (int(particle['x']), int(particle['y']))
-            pygame.draw.circle(screen, particle['color'], pos, size)
+        self.particles.draw(screen)
+    
+    def invalidate_background(self):
+        """Rebuild the current scene's cached static layer on the next frame."""
+        self._static_layer = None
     
     def change_scene(self, scene: GameScene):
         """Change the current game scene."""
         self.game_state.current_scene = scene
         self.ui_manager.clear_and_reset()
+        self.invalidate_background()
         
         # Initialize the new scene
         if scene in self.scenes:
             self.scenes[scene].setup()
     
+    def _draw_frame(self, current_scene):
+        """Redraw the whole screen and flip it."""
+        self.screen.fill(self.BLACK)
+        
+        # Draw matrix rain background
+        self.draw_matrix_rain(self.screen)
+        
+        if current_scene:
+            current_scene.draw(self.screen)
+        
+        # Draw particles on top
+        self.draw_particles(self.screen)
+        
+        self.ui_manager.draw_ui(self.screen)
+        
+        # Draw post-UI overlays (must be after UI manager)
+        if current_scene and hasattr(current_scene, 'draw_overlay'):
+            current_scene.draw_overlay(self.screen)
+        
+        pygame.display.flip()
+    
+    def _draw_dirty_frame(self, current_scene):
+        """
+        Redraw and push only the regions that changed since the last frame.
+        
+        The scene's draw_background output is cached in a transparent layer.
+        Each frame the dirty region - what was drawn last frame, the rain's
+        new positions, the particles and any UI element that changed - is
+        merged into disjoint rects. Those are cleared, the rain is drawn and
+        the layer restored over them, then the scene's draw_dynamic, the
+        particles and the UI go on top, with the UI blitted only into the
+        dirty rects. Only the dirty rects are pushed to the display.
+        """
+        screen = self.screen
+        screen_rect = screen.get_rect()
+        if self._static_layer is None or self._static_layer.get_size() != screen.get_size():
+            self._static_layer = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            current_scene.draw_background(self._static_layer)
+            self._previous_rects = [screen_rect]
+            self._ui_state = {}
+        
+        rain_rects = self.matrix_rain.rects()
+        particle_bounds = self.particles.bounds()
+        moving = rain_rects + ([particle_bounds] if particle_bounds is not None else [])
+        dirty = _merge_rects(self._previous_rects + moving + self._changed_ui_rects(), screen_rect)
+        
+        dynamic_rects = self._compose_dirty(current_scene, dirty)
+        outside = [rect for rect in map(screen_rect.clip, dynamic_rects)
+                   if rect.w and rect.h and not any(area.contains(rect) for area in dirty)]
+        if outside:
+            # draw_dynamic drew outside the dirty region; recompose with it included
+            dirty = _merge_rects(dirty + dynamic_rects, screen_rect)
+            dynamic_rects = self._compose_dirty(current_scene, dirty)
+        
+        self.particles.draw(screen)
+        self._draw_ui_into(dirty)
+        drawn = moving + dynamic_rects
+        
+        # Overlays that don't report their rects redraw the whole screen
+        pushed = dirty
+        if hasattr(current_scene, 'draw_overlay'):
+            overlay_rects = current_scene.draw_overlay(screen)
+            overlay_rects = overlay_rects if overlay_rects is not None else [screen_rect]
+            drawn += overlay_rects
+            pushed = dirty + overlay_rects
+        
+        pygame.display.update(pushed)
+        self._previous_rects = drawn
+    
+    def _compose_dirty(self, current_scene, dirty):
+        """
+        Clear the dirty rects and redraw the rain, static layer and the scene's dynamic parts.
+        
+        Returns:
+            The rects draw_dynamic drew to
+        """
+        screen = self.screen
+        for rect in dirty:
+            screen.fill(self.BLACK, rect)
+        self.draw_matrix_rain(screen)
+        for rect in dirty:
+            screen.blit(self._static_layer, rect, rect)
+        return [pygame.Rect(rect) for rect in current_scene.draw_dynamic(screen)]
+    
+    def _changed_ui_rects(self):
+        """
+        Get the screen areas of UI elements that look different since the last frame.
+        
+        An element counts as changed when its image, rect or visibility
+        changed or it was removed (its old and new areas are returned), or
+        while it is hovered, focused or mid-transition, since those states
+        can redraw its image in place. The root container is skipped: it
+        covers the whole screen but draws nothing.
+        """
+        root = self.ui_manager.get_root_container()
+        state = {}
+        changed = []
+        for sprite in self.ui_manager.get_sprite_group().sprites():
+            if sprite is root:
+                continue
+            rect = pygame.Rect(sprite.rect)
+            visible = bool(sprite.visible) and sprite.image is not None
+            state[sprite] = (sprite.image, tuple(rect), visible)
+            previous = self._ui_state.pop(sprite, None)
+            if previous is None or previous[0] is not sprite.image or previous[1:] != state[sprite][1:]:
+                if previous is not None and previous[2]:
+                    changed.append(pygame.Rect(previous[1]))
+                if visible:
+                    changed.append(rect)
+            elif visible and _is_animating(sprite):
+                changed.append(rect)
+        # Elements that were removed since the last frame
+        changed += [pygame.Rect(rect) for _, rect, visible in self._ui_state.values() if visible]
+        self._ui_state = state
+        return changed
+    
+    def _draw_ui_into(self, rects):
+        """Draw the UI, blitting each visible element only where it overlaps the given rects."""
+        screen = self.screen
+        for image, rect, _, blendmode in self.ui_manager.get_sprite_group().visible:
+            for index in rect.collidelistall(rects):
+                area = rect.clip(rects[index])
+                screen.blit(image, area, area.move(-rect.x, -rect.y), blendmode)
+    
     def run(self):
         """Main game loop."""
         # Start with title scene
@@ -196,6 +294,7 @@ class Game:
                     self.ui_manager.set_window_resolution((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
                     # Clear and reinitialize current scene for new size
                     self.ui_manager.clear_and_reset()
+                    self.invalidate_background()
                     if self.game_state.current_scene in self.scenes:
                         scene = self.scenes[self.game_state.current_scene]
                         # Preserve timer on resize if scene supports it
@@ -228,28 +327,44 @@ class Game:
                 current_scene.update(time_delta)
             
             # Draw
-            self.screen.fill(self.BLACK)
-            
-            # Draw matrix rain background
-            self.draw_matrix_rain(self.screen)
-            
-            if current_scene:
-                current_scene.draw(self.screen)
-            
-            # Draw particles on top
-            self.draw_particles(self.screen)
-            
-            self.ui_manager.draw_ui(self.screen)
-            
-            # Draw post-UI overlays (must be after UI manager)
-            if current_scene and hasattr(current_scene, 'draw_overlay'):
-                current_scene.draw_overlay(self.screen)
-            
-            pygame.display.flip()
+            if self.dirty_rects and current_scene and hasattr(current_scene, 'draw_background'):
+                self._draw_dirty_frame(current_scene)
+            else:
+                self._draw_frame(current_scene)
         
+        self.game_state.shutdown()
         pygame.quit()
 
 
+def _is_animating(sprite) -> bool:
+    """Check whether a UI element may be redrawing its image in place this frame."""
+    if getattr(sprite, 'hovered', False) or getattr(sprite, 'is_focused', False):
+        return True
+    shape = getattr(sprite, 'drawable_shape', None)
+    active_state = getattr(shape, 'active_state', None)
+    return getattr(active_state, 'transition', None) is not None
+
+
+def _merge_rects(rects, bounds):
+    """
+    Clip rects to bounds and merge overlapping ones.
+    
+    The result is disjoint, so restoring or blitting into each rect touches
+    every pixel at most once.
+    """
+    merged = []
+    for rect in rects:
+        rect = bounds.clip(rect)
+        if not rect.w or not rect.h:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
 def main():
     """Entry point for the game."""
     game = Game()
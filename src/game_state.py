@@ -1,9 +1,12 @@
 """Game state management."""
+import os
 from enum import Enum
+from typing import Optional
 from pathlib import Path
 from .level_loader import LevelLoader
 from .save_system import SaveSystem
 from .code_evaluator import CodeEvaluator
+from .sandbox import ProcessPoolBackend
 
 
 class GameScene(Enum):
@@ -27,9 +30,13 @@ class GameState:
         self.save_dir = Path.home() / ".mission_pythonic"
         
         # Systems
-        self.level_loader = LevelLoader(self.levels_dir)
+        self.level_loader = LevelLoader(self.levels_dir, index_cache=self.save_dir / "level_index.json")
         self.save_system = SaveSystem(self.save_dir)
-        self.evaluator = CodeEvaluator()
+        # Dev mode: pick up edits to levels/*.json without restarting
+        if os.environ.get("MISSION_PYTHONIC_DEV"):
+            self.level_loader.start_watching()
+        # Run submissions in worker processes so runaway code can't freeze the game
+        self.evaluator = CodeEvaluator(backend=ProcessPoolBackend())
         
         # Game state
         self.current_scene = GameScene.TITLE
@@ -51,6 +58,8 @@ class GameState:
         self.timer_active = False
         self.timer_paused = False
         self.pause_start_time = 0
+        # Pauses nest (e.g. the pause menu opened while code is running)
+        self.pause_depth = 0
         
         # Troll messages for various situations
         self.time_up_messages = [
@@ -90,20 +99,29 @@ class GameState:
         
         self.attempt_count = 0
     
+    def shutdown(self):
+        """Release background resources before the game exits."""
+        self.evaluator.shutdown()
+        self.level_loader.close()
+    
     def load_saved_game(self):
         """Load saved game progress."""
         data = self.save_system.load_progress()
         if data:
             self.player_name = data.get("player_name", "")
             self.completed_levels = data.get("completed_levels", [])
-            self.current_level_id = f"level_{data.get('current_level', 1):03d}"
+            index = self.level_loader.get_index()
+            entry = index.at(data.get("current_level", 1) - 1) or index.at(0)
+            self.current_level_id = entry.id if entry else "level_001"
             self.total_score = data.get("total_score", 0)
             return True
         return False
     
     def save_game(self):
         """Save current game progress."""
-        current_level_num = int(self.current_level_id.split('_')[-1])
+        # Saves store the 1-based position of the current level in the pack
+        position = self.level_loader.get_index().position(self.current_level_id)
+        current_level_num = position + 1 if position is not None else 1
         self.save_system.save_progress(
             self.player_name,
             self.completed_levels,
@@ -119,13 +137,15 @@ class GameState:
         """Get all levels."""
         return self.level_loader.get_all_levels()
     
+    def get_level_entries(self):
+        """Get lightweight index entries (id, title, difficulty, points) for all levels."""
+        return self.level_loader.get_level_entries()
+    
     def go_to_next_level(self):
         """Advance to the next level."""
-        current_num = int(self.current_level_id.split('_')[-1])
-        next_num = current_num + 1
-        next_id = f"level_{next_num:03d}"
+        next_id = self.level_loader.get_index().next_id(self.current_level_id)
         
-        if self.level_loader.get_level(next_id):
+        if next_id is not None:
             self.current_level_id = next_id
             self.current_hint_index = 0
             self.show_solution = False
@@ -138,13 +158,19 @@ class GameState:
         """Check if a level is completed."""
         return level_id in self.completed_levels
     
-    def complete_current_level(self):
-        """Mark current level as completed."""
+    def complete_current_level(self, elapsed_time: Optional[float] = None):
+        """
+        Mark current level as completed.
+        
+        Args:
+            elapsed_time: Level time the solution is judged by (e.g. when it was
+                submitted); defaults to the current elapsed time
+        """
         level = self.get_current_level()
         if level and level.id not in self.completed_levels:
             self.completed_levels.append(level.id)
             # Apply time penalty if over time
-            penalty = self.get_time_penalty()
+            penalty = self.get_time_penalty(elapsed_time)
             points_earned = max(10, level.points - penalty)  # Minimum 10 points
             self.total_score += points_earned
             self.stop_timer()
@@ -163,6 +189,7 @@ class GameState:
         self.elapsed_time = 0
         self.timer_active = True
         self.timer_paused = False
+        self.pause_depth = 0
     
     def update_timer(self):
         """Update elapsed time if timer is active."""
@@ -171,15 +198,20 @@ class GameState:
             self.elapsed_time = time.time() - self.level_start_time
     
     def pause_timer(self):
-        """Pause the timer."""
-        if self.timer_active and not self.timer_paused:
-            import time
-            self.timer_paused = True
-            self.pause_start_time = time.time()
+        """Pause the timer (each call needs a matching resume_timer)."""
+        if self.timer_active:
+            if not self.timer_paused:
+                import time
+                self.timer_paused = True
+                self.pause_start_time = time.time()
+            self.pause_depth += 1
     
     def resume_timer(self):
-        """Resume the timer."""
+        """Resume the timer once every pause has been released."""
         if self.timer_active and self.timer_paused:
+            self.pause_depth = max(0, self.pause_depth - 1)
+            if self.pause_depth:
+                return
             import time
             pause_duration = time.time() - self.pause_start_time
             self.level_start_time += pause_duration
@@ -189,21 +221,24 @@ class GameState:
         """Stop the timer."""
         self.timer_active = False
         self.timer_paused = False
+        self.pause_depth = 0
     
-    def get_time_remaining(self) -> float:
-        """Get remaining time for current level."""
+    def get_time_remaining(self, elapsed_time: Optional[float] = None) -> float:
+        """Get remaining time for current level (at elapsed_time, default now)."""
         level = self.get_current_level()
         if not level or not hasattr(level, 'time_limit'):
             return float('inf')
-        return level.time_limit - self.elapsed_time
+        if elapsed_time is None:
+            elapsed_time = self.elapsed_time
+        return level.time_limit - elapsed_time
     
     def is_time_up(self) -> bool:
         """Check if time has run out."""
         return self.get_time_remaining() <= 0
     
-    def get_time_penalty(self) -> int:
-        """Calculate point penalty for going over time."""
-        overtime = -self.get_time_remaining()
+    def get_time_penalty(self, elapsed_time: Optional[float] = None) -> int:
+        """Calculate point penalty for going over time (at elapsed_time, default now)."""
+        overtime = -self.get_time_remaining(elapsed_time)
         if overtime <= 0:
             return 0
         # Lose 5 points per 10 seconds overtime
@@ -0,0 +1,128 @@
+"""Packed level bundle: every level in one indexed, memory-mapped file."""
+import json
+import marshal
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BUNDLE_NAME = "levels.bundle"
+MAGIC = b"MPLB"
+VERSION = 2
+
+# magic, format version, marshal version, level count
+_HEADER = struct.Struct("<4sHHI")
+# Per level: offset/length of the index metadata, offset/length of the body
+_RECORD = struct.Struct("<IIII")
+
+
+def build_bundle(levels_dir: Path, output: Path) -> int:
+    """
+    Compile every level_*.json file in levels_dir into a single bundle.
+
+    Layout: header, a table of fixed-size records, then the metadata and
+    body blobs. Metadata is (id, title, difficulty, points, category) so
+    the index never touches a level body; bodies are the level dicts in
+    marshal format, which loads straight from a slice of the mapped file.
+
+    Args:
+        levels_dir: Directory with the authoring JSON files
+        output: Bundle file to write (replaced atomically)
+
+    Returns:
+        The number of levels written
+    """
+    from .level_loader import Level
+
+    levels = []
+    for path in sorted(levels_dir.glob("level_*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # Reject levels the loader couldn't construct before they are shipped
+        level = Level(data)
+        levels.append((level, data))
+    levels.sort(key=lambda item: item[0].id)
+
+    table_end = _HEADER.size + _RECORD.size * len(levels)
+    records = []
+    blobs = []
+    offset = table_end
+    for level, data in levels:
+        meta = marshal.dumps((level.id, level.title, level.difficulty, level.points, level.category))
+        body = marshal.dumps(data)
+        records.append(_RECORD.pack(offset, len(meta), offset + len(meta), len(body)))
+        blobs.append(meta)
+        blobs.append(body)
+        offset += len(meta) + len(body)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, marshal.version, len(levels)))
+        f.writelines(records)
+        f.writelines(blobs)
+    os.replace(tmp_path, output)
+    return len(levels)
+
+
+class LevelBundle:
+    """Read-only view of a level bundle through mmap."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file object is closed
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_table()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _read_table(self):
+        """Validate the header and load the (small) metadata table."""
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{self.path.name} is not a level bundle")
+        magic, version, marshal_version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path.name} is not a level bundle")
+        if version != VERSION or marshal_version > marshal.version:
+            raise ValueError(f"{self.path.name} was built by an incompatible version")
+        if _HEADER.size + _RECORD.size * count > len(self._mmap):
+            raise ValueError(f"{self.path.name} is truncated")
+
+        self._bodies = {}
+        self._metadata = []
+        for i in range(count):
+            meta_offset, meta_len, body_offset, body_len = _RECORD.unpack_from(
+                self._mmap, _HEADER.size + _RECORD.size * i
+            )
+            if body_offset + body_len > len(self._mmap):
+                raise ValueError(f"{self.path.name} is truncated")
+            meta = self._load(meta_offset, meta_len)
+            self._metadata.append(meta)
+            self._bodies[meta[0]] = (body_offset, body_len)
+
+    def _load(self, offset: int, length: int):
+        """Unmarshal a blob directly from the mapped file."""
+        with memoryview(self._mmap) as view, view[offset:offset + length] as blob:
+            return marshal.loads(blob)
+
+    def metadata(self) -> List[Tuple[str, str, str, int, Optional[str]]]:
+        """Get (id, title, difficulty, points, category) for every level, sorted by ID."""
+        return list(self._metadata)
+
+    def read(self, level_id: str) -> Dict[str, Any]:
+        """
+        Get the raw level data for a level.
+
+        Raises:
+            KeyError: If the bundle has no such level
+        """
+        offset, length = self._bodies[level_id]
+        return self._load(offset, length)
+
+    def close(self):
+        """Unmap the bundle file."""
+        self._mmap.close()
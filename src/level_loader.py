@@ -1,7 +1,13 @@
 """Load and manage game levels."""
 import json
+import threading
+from bisect import bisect_left, insort
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterator
+from .eval_cache import LRUCache
+from .checkers import compile_checker
+from .sandbox import NamespaceSpec
+from .level_bundle import BUNDLE_NAME, LevelBundle
 
 
 class Level:
@@ -15,46 +21,449 @@ class Level:
         self.starter_code = data["starter_code"]
         self.solution = data["solution"]
         self.checker = data["checker"]
+        # Validated and compiled once here so evaluations never re-read the config
+        self.compiled_checker = compile_checker(self.checker)
         self.hints = data.get("hints", [])
         self.points = data.get("points", 100)
         self.difficulty = data.get("difficulty", "beginner")
+        self.category = data.get("category", None)
         self.requires_file = data.get("requires_file", None)
+        # Helper modules and setup code shared by every run of this level
+        self.preload = data.get("preload", [])
+        self.setup_code = data.get("setup_code", None)
+        # Seeds `random` for reproducible runs; null in the JSON leaves it unseeded
+        self.random_seed = data.get("random_seed", self.id)
+        self.namespace_spec = None
+        if self.preload or self.setup_code:
+            self.namespace_spec = NamespaceSpec(self.preload, self.setup_code)
         self.time_limit = data.get("time_limit", 300)  # Default 5 minutes
         self.time_warning = data.get("time_warning", 60)  # Warning at 1 minute left
 
 
+class LevelIndexEntry:
+    """Lightweight summary of a level: enough for menus without loading the full level."""
+    
+    __slots__ = ("id", "title", "difficulty", "points", "category", "path")
+    
+    def __init__(self, level_id: str, title: str, difficulty: str, points: int,
+                 category: Optional[str], path: Path):
+        self.id = level_id
+        self.title = title
+        self.difficulty = difficulty
+        self.points = points
+        self.category = category
+        self.path = path
+    
+    @classmethod
+    def from_level(cls, level: Level, path: Path) -> "LevelIndexEntry":
+        """Build an entry from a fully loaded level."""
+        return cls(level.id, level.title, level.difficulty, level.points, level.category, path)
+
+
+class LevelIndex:
+    """
+    Level index entries kept in ID order.
+    
+    Positions and next/previous lookups are O(1). Adding or removing a
+    level only renumbers the levels after it, so appending to the end of a
+    pack costs nothing extra. Entries are also grouped by category and by
+    difficulty so filtered views never scan the whole pack.
+    """
+    
+    GROUP_FIELDS = ("category", "difficulty")
+    
+    def __init__(self, entries=()):
+        self._entries = {}
+        self._order = []
+        self._positions = {}
+        self._groups = {}
+        for entry in sorted(entries, key=lambda e: e.id):
+            self.add(entry)
+    
+    def add(self, entry: LevelIndexEntry):
+        """Insert an entry, replacing any existing entry with the same ID."""
+        if entry.id in self._entries:
+            self.remove(entry.id)
+        position = bisect_left(self._order, entry.id)
+        self._order.insert(position, entry.id)
+        self._entries[entry.id] = entry
+        self._renumber(position)
+        for field in self.GROUP_FIELDS:
+            insort(self._groups.setdefault((field, getattr(entry, field)), []), entry.id)
+    
+    def remove(self, level_id: str) -> Optional[LevelIndexEntry]:
+        """Remove an entry by ID; returns it, or None if it wasn't indexed."""
+        entry = self._entries.pop(level_id, None)
+        if entry is None:
+            return None
+        position = self._positions.pop(level_id)
+        del self._order[position]
+        self._renumber(position)
+        for field in self.GROUP_FIELDS:
+            key = (field, getattr(entry, field))
+            group = self._groups[key]
+            del group[bisect_left(group, level_id)]
+            if not group:
+                del self._groups[key]
+        return entry
+    
+    def _renumber(self, start: int):
+        """Refresh cached positions from start to the end of the order."""
+        for position in range(start, len(self._order)):
+            self._positions[self._order[position]] = position
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def __contains__(self, level_id: str) -> bool:
+        return level_id in self._entries
+    
+    def copy(self) -> "LevelIndex":
+        """Get an independent copy (entries themselves are shared)."""
+        clone = LevelIndex()
+        clone._entries = dict(self._entries)
+        clone._order = list(self._order)
+        clone._positions = dict(self._positions)
+        clone._groups = {key: list(group) for key, group in self._groups.items()}
+        return clone
+    
+    def __iter__(self) -> Iterator[LevelIndexEntry]:
+        return (self._entries[level_id] for level_id in self._order)
+    
+    def get(self, level_id: str) -> Optional[LevelIndexEntry]:
+        """Get the entry for a level ID."""
+        return self._entries.get(level_id)
+    
+    def ids(self) -> List[str]:
+        """Get all level IDs in order."""
+        return list(self._order)
+    
+    def position(self, level_id: str) -> Optional[int]:
+        """Get the zero-based position of a level, or None if it isn't indexed."""
+        return self._positions.get(level_id)
+    
+    def at(self, position: int) -> Optional[LevelIndexEntry]:
+        """Get the entry at a zero-based position, or None if out of range."""
+        if 0 <= position < len(self._order):
+            return self._entries[self._order[position]]
+        return None
+    
+    def next_id(self, level_id: str) -> Optional[str]:
+        """Get the ID of the level after level_id, or None at the end."""
+        position = self._positions.get(level_id)
+        if position is None or position + 1 >= len(self._order):
+            return None
+        return self._order[position + 1]
+    
+    def previous_id(self, level_id: str) -> Optional[str]:
+        """Get the ID of the level before level_id, or None at the start."""
+        position = self._positions.get(level_id)
+        if not position:
+            return None
+        return self._order[position - 1]
+    
+    def filter(self, category: Optional[str] = None,
+               difficulty: Optional[str] = None) -> List[LevelIndexEntry]:
+        """Get entries (in order) matching the given category and/or difficulty."""
+        criteria = [(field, value) for field, value in zip(self.GROUP_FIELDS, (category, difficulty))
+                    if value is not None]
+        if not criteria:
+            return list(self)
+        # Walk the smallest matching group and check the other criterion per entry
+        groups = sorted((self._groups.get(key, []) for key in criteria), key=len)
+        return [self._entries[level_id] for level_id in groups[0]
+                if all(getattr(self._entries[level_id], field) == value for field, value in criteria)]
+
+
 class LevelLoader:
-    """Loads levels from JSON files."""
+    """
+    Loads levels from JSON files.
+    
+    Only a small index (id, title, difficulty, points, path) is kept for
+    every level. It is built on first use, not at construction, and can be
+    persisted to index_cache so later launches only stat the level files.
+    Full Level objects are parsed on demand and kept in an LRU cache.
+    
+    If a packed bundle (see level_bundle) is present it is used instead of
+    the JSON files: the index comes from its header table and levels are
+    read from the memory-mapped file without scanning the directory.
+    
+    In dev mode a watcher thread polls the JSON files and re-parses only
+    the ones that were added, changed or removed (see poll_changes).
+    """
+    
+    INDEX_VERSION = 2
     
-    def __init__(self, levels_dir: Path):
+    def __init__(self, levels_dir: Path, index_cache: Optional[Path] = None, cache_size: int = 64,
+                 bundle_path: Optional[Path] = None):
         self.levels_dir = levels_dir
-        self.levels = {}
-        self._load_all_levels()
+        self.index_cache = index_cache
+        self.bundle_path = bundle_path if bundle_path is not None else levels_dir / BUNDLE_NAME
+        self._bundle = None
+        self._entries = None
+        # level file -> (mtime_ns, size, level id) as of the last scan
+        self._file_stats = {}
+        self._level_cache = LRUCache(cache_size)
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        # Bumped whenever poll_changes applies a change, so scenes can notice
+        self.generation = 0
     
-    def _load_all_levels(self):
-        """Load all level files from the levels directory."""
+    def _read_index_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the persisted index, keyed by file name."""
+        if self.index_cache is None or not self.index_cache.exists():
+            return {}
+        try:
+            with open(self.index_cache, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading level index cache: {e}")
+            return {}
+        if data.get("version") != self.INDEX_VERSION or data.get("levels_dir") != str(self.levels_dir):
+            return {}
+        return data.get("files", {})
+    
+    def _write_index_cache(self, files: Dict[str, Dict[str, Any]]):
+        """Persist the index so the next launch can skip parsing unchanged files."""
+        if self.index_cache is None:
+            return
+        data = {"version": self.INDEX_VERSION, "levels_dir": str(self.levels_dir), "files": files}
+        try:
+            self.index_cache.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_cache, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"Error saving level index cache: {e}")
+    
+    def _open_bundle(self) -> bool:
+        """Index levels from the packed bundle, if there is a usable one."""
+        if not self.bundle_path.exists():
+            return False
+        try:
+            bundle = LevelBundle(self.bundle_path)
+        except Exception as e:
+            print(f"Error loading level bundle {self.bundle_path.name}: {e}")
+            return False
+        self._bundle = bundle
+        self._entries = LevelIndex(
+            LevelIndexEntry(level_id, title, difficulty, points, category, self.bundle_path)
+            for level_id, title, difficulty, points, category in bundle.metadata()
+        )
+        return True
+    
+    def _build_index(self):
+        """Scan the levels directory, parsing only files the index cache doesn't cover."""
+        if self._open_bundle():
+            return
+        
+        entries = LevelIndex()
+        self._file_stats = {}
         if not self.levels_dir.exists():
             print(f"Warning: Levels directory not found: {self.levels_dir}")
+            self._entries = entries
             return
         
+        cached_files = self._read_index_cache()
+        files = {}
+        changed = False
         level_files = sorted(self.levels_dir.glob("level_*.json"))
         for level_file in level_files:
             try:
-                with open(level_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    level = Level(data)
-                    self.levels[level.id] = level
+                stat = level_file.stat()
+                record = cached_files.get(level_file.name)
+                if record is None or record["mtime_ns"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+                    level = self._parse_level_file(level_file)
+                    self._level_cache.put(level.id, level)
+                    record = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "id": level.id,
+                        "title": level.title,
+                        "difficulty": level.difficulty,
+                        "points": level.points,
+                        "category": level.category,
+                    }
+                    changed = True
+                files[level_file.name] = record
+                self._file_stats[level_file] = (stat.st_mtime_ns, stat.st_size, record["id"])
+                entries.add(LevelIndexEntry(
+                    record["id"], record["title"], record["difficulty"], record["points"],
+                    record["category"], level_file
+                ))
             except Exception as e:
                 print(f"Error loading {level_file.name}: {e}")
+        
+        if changed or len(files) != len(cached_files):
+            self._write_index_cache(files)
+        self._entries = entries
+    
+    def _ensure_index(self) -> LevelIndex:
+        """Get the level index, building it on first use."""
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._build_index()
+        return self._entries
+    
+    @staticmethod
+    def _parse_level_file(path: Path) -> Level:
+        """Read and parse a single level file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return Level(json.load(f))
+    
+    def _read_level(self, entry: LevelIndexEntry) -> Level:
+        """Load the full level for an index entry from the bundle or its JSON file."""
+        if self._bundle is not None and entry.path == self.bundle_path:
+            return Level(self._bundle.read(entry.id))
+        return self._parse_level_file(entry.path)
     
     def get_level(self, level_id: str) -> Optional[Level]:
-        """Get a level by its ID."""
-        return self.levels.get(level_id)
+        """Get a level by its ID, loading it from disk if it isn't cached."""
+        entry = self._ensure_index().get(level_id)
+        if entry is None:
+            return None
+        
+        level = self._level_cache.get(level_id)
+        if level is None:
+            try:
+                level = self._read_level(entry)
+            except Exception as e:
+                print(f"Error loading {entry.path.name}: {e}")
+                return None
+            self._level_cache.put(level_id, level)
+        return level
+    
+    def get_index(self) -> LevelIndex:
+        """Get the ordered level index (for navigation and filtering)."""
+        return self._ensure_index()
+    
+    def get_level_entries(self) -> List[LevelIndexEntry]:
+        """Get index entries for all levels sorted by ID (no level bodies are loaded)."""
+        return list(self._ensure_index())
     
     def get_all_levels(self):
-        """Get all levels sorted by ID."""
-        return [self.levels[key] for key in sorted(self.levels.keys())]
+        """Get all levels sorted by ID (loads every level; prefer get_level_entries for menus)."""
+        levels = (self.get_level(entry.id) for entry in self.get_level_entries())
+        return [level for level in levels if level is not None]
     
     def get_level_count(self) -> int:
         """Get total number of levels."""
-        return len(self.levels)
+        return len(self._ensure_index())
+    
+    def poll_changes(self) -> List[str]:
+        """
+        Re-parse level files added, changed or removed since the last scan.
+        
+        The new index is built on a copy and swapped in with one assignment,
+        so readers see either the old or the new set of levels, never a mix.
+        A file that fails to parse (e.g. saved half-way), or whose id is
+        already used by another level file, keeps its previous version
+        until it changes again.
+        
+        Returns:
+            IDs of the levels that were reloaded or removed
+        """
+        with self._lock:
+            index = self._ensure_index()
+            if self._bundle is not None or not self.levels_dir.exists():
+                return []
+            
+            current = {}
+            for level_file in self.levels_dir.glob("level_*.json"):
+                try:
+                    stat = level_file.stat()
+                except OSError:
+                    continue  # Deleted between listing and stat
+                current[level_file] = (stat.st_mtime_ns, stat.st_size)
+            
+            known = self._file_stats
+            changed = sorted(path for path, sig in current.items()
+                             if path not in known or known[path][:2] != sig)
+            removed = [path for path in known if path not in current]
+            if not changed and not removed:
+                return []
+            
+            new_index = index.copy()
+            file_stats = dict(known)
+            touched = []
+            
+            def drop(level_id: Optional[str], path: Path):
+                # Only if the index still points this level at the file
+                entry = new_index.get(level_id) if level_id else None
+                if entry is not None and entry.path == path:
+                    new_index.remove(level_id)
+                    self._level_cache.discard(level_id)
+                    touched.append(level_id)
+            
+            for path in removed:
+                drop(file_stats.pop(path)[2], path)
+            
+            for path in changed:
+                old_id = known[path][2] if path in known else None
+                try:
+                    level = self._parse_level_file(path)
+                except Exception as e:
+                    print(f"Error reloading {path.name}: {e}")
+                    file_stats[path] = current[path] + (old_id,)
+                    continue
+                owner = new_index.get(level.id)
+                if owner is not None and owner.path != path and owner.path in current:
+                    print(f"Warning: not reloading {path.name}: level id '{level.id}' "
+                          f"is already used by {owner.path.name}")
+                    file_stats[path] = current[path] + (old_id,)
+                    continue
+                if old_id != level.id:
+                    drop(old_id, path)
+                self._level_cache.put(level.id, level)
+                new_index.add(LevelIndexEntry.from_level(level, path))
+                file_stats[path] = current[path] + (level.id,)
+                touched.append(level.id)
+            
+            self._file_stats = file_stats
+            self._entries = new_index
+            if touched:
+                self.generation += 1
+            return touched
+    
+    def _watch(self, interval: float):
+        """Watcher thread body: poll until stop_watching is called."""
+        while not self._stop_watching.wait(interval):
+            try:
+                reloaded = self.poll_changes()
+            except Exception as e:
+                print(f"Error watching levels: {e}")
+                continue
+            if reloaded:
+                print(f"Reloaded levels: {', '.join(reloaded)}")
+    
+    def start_watching(self, interval: float = 1.0):
+        """Start polling the level files for changes on a background thread."""
+        if self._watcher is not None:
+            return
+        self._ensure_index()
+        if self._bundle is not None:
+            print("Warning: levels are loaded from a bundle; hot reload is disabled")
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name="level-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Stop the watcher thread, if running."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+    
+    def close(self):
+        """Stop watching and release the level bundle, if one is mapped."""
+        self.stop_watching()
+        with self._lock:
+            if self._bundle is not None:
+                self._bundle.close()
+                self._bundle = None
+                self._entries = None
+                self._level_cache.clear()
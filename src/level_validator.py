@@ -0,0 +1,164 @@
+"""Level pack validation: schema checks plus running every solution against its own checker."""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+
+from .batch_grader import imap_ordered
+from .checkers import checker_errors, describe_type_error
+from .code_evaluator import CodeEvaluator
+from .level_loader import Level
+from .sandbox import ProcessPoolBackend
+
+# Field name -> (accepted types, required)
+LEVEL_FIELDS = {
+    "id": (str, True),
+    "title": (str, True),
+    "mission_log": (str, True),
+    "challenge": (str, True),
+    "starter_code": (str, True),
+    "solution": (str, True),
+    "checker": (dict, True),
+    "hints": (list, False),
+    "points": (int, False),
+    "difficulty": (str, False),
+    "category": ((str, type(None)), False),
+    "requires_file": ((dict, list, type(None)), False),
+    "preload": (list, False),
+    "setup_code": ((str, type(None)), False),
+    "random_seed": ((int, str, type(None)), False),
+    "time_limit": ((int, float), False),
+    "time_warning": ((int, float), False),
+}
+
+
+def validate_schema(data: Any) -> List[str]:
+    """
+    Check raw level JSON against the fields Level expects.
+
+    Returns:
+        A list of problems (empty if the level is well formed)
+    """
+    if not isinstance(data, dict):
+        return ["level file should contain a JSON object"]
+
+    errors = []
+    for name, (expected, required) in LEVEL_FIELDS.items():
+        if name not in data:
+            if required:
+                errors.append(f"missing required field '{name}'")
+            continue
+        error = describe_type_error(name, data[name], expected)
+        if error:
+            errors.append(error)
+
+    if isinstance(data.get("checker"), dict):
+        errors.extend(checker_errors(data["checker"]))
+    return errors
+
+
+class LevelReport:
+    """Validation outcome for one level file."""
+
+    def __init__(self, path: Path, level_id: Optional[str], errors: List[str], elapsed: float):
+        self.path = path
+        self.level_id = level_id
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
+
+class LevelValidator:
+    """Validates level files, running their solutions across worker processes."""
+
+    def __init__(self, workers: int, timeout: float):
+        self.workers = workers
+        self.evaluator = CodeEvaluator(
+            backend=ProcessPoolBackend(workers=workers, timeout=timeout), verdict_cache_size=0
+        )
+
+    def validate_file(self, path: Path) -> LevelReport:
+        """Validate one level file: parse, check its schema, then run its solution."""
+        start = time.perf_counter()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            return LevelReport(path, None, [f"cannot read level: {e}"], time.perf_counter() - start)
+
+        level_id = data.get("id") if isinstance(data, dict) else None
+        errors = validate_schema(data)
+        if not errors:
+            # Every multi_test case runs too, since evaluate_level expands them
+            try:
+                success, message = self.evaluator.evaluate_level(data["solution"], Level(data))
+            except Exception as e:
+                success, message = False, f"Error: {type(e).__name__}: {e}"
+            if not success:
+                errors.append(f"solution fails its checker: {message}")
+        return LevelReport(path, level_id, errors, time.perf_counter() - start)
+
+    def validate(self, paths: Iterable[Path]) -> Iterator[LevelReport]:
+        """Validate level files in parallel, yielding reports in input order."""
+        with ThreadPoolExecutor(max_workers=self.workers * 2) as executor:
+            yield from imap_ordered(executor, self.validate_file, paths, window=self.workers * 4)
+
+    def shutdown(self):
+        """Stop the evaluation workers."""
+        self.evaluator.shutdown()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(
+        description="Check that every Mission: Pythonic level is well formed and its solution passes."
+    )
+    parser.add_argument("levels", type=Path, nargs="?", default=base_dir / "levels",
+                        help="Levels directory or a single level file (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of evaluation worker processes (default: all cores)")
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="Wall-clock limit per run in seconds (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not args.levels.exists():
+        parser.error(f"{args.levels} does not exist")
+    if args.levels.is_dir():
+        paths = sorted(args.levels.glob("level_*.json"))
+    else:
+        paths = [args.levels]
+
+    validator = LevelValidator(max(1, args.workers), args.timeout)
+    start = time.perf_counter()
+    seen_ids = {}
+    failed = 0
+    try:
+        for report in validator.validate(paths):
+            if report.level_id in seen_ids:
+                report.errors.append(f"duplicate id {report.level_id!r} (also in {seen_ids[report.level_id]})")
+            elif report.level_id is not None:
+                seen_ids[report.level_id] = report.path.name
+
+            status = "PASS" if report.passed else "FAIL"
+            print(f"{status}  {report.path.name:<20} {report.elapsed * 1000:8.1f} ms")
+            for error in report.errors:
+                print(f"      - {error}")
+            failed += not report.passed
+    finally:
+        validator.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(paths) - failed}/{len(paths)} levels passed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Matrix rain background drawn from a pre-rendered glyph atlas."""
+import random
+from array import array
+from operator import add
+from typing import List, Sequence, Tuple
+
+import pygame
+
+RAIN_CHARS = "01ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class GlyphAtlas:
+    """Every character of a set pre-rendered once in each of a fixed list of colors."""
+
+    def __init__(self, font: pygame.font.Font, chars: str, colors: Sequence[Tuple[int, int, int]]):
+        self.chars = chars
+        self.colors = list(colors)
+        # glyphs[color_index][char_index]
+        self.glyphs = [[font.render(char, True, color) for char in chars] for color in self.colors]
+
+    def glyph(self, char_index: int, color_index: int = 0) -> pygame.Surface:
+        """Get the pre-rendered surface for a character in one of the atlas colors."""
+        return self.glyphs[color_index][char_index]
+
+
+class MatrixRain:
+    """
+    Falling green characters behind every scene.
+
+    Column state (position, speed, character, brightness) is kept in
+    parallel arrays updated in bulk each frame, brightness is quantized to
+    the atlas levels, and the whole effect is drawn with one Surface.blits.
+    """
+
+    def __init__(self, font: pygame.font.Font, width: int, height: int, columns: int = 50,
+                 brightness_levels: int = 8, flicker: float = 0.1):
+        """
+        Args:
+            font: Font for the glyphs
+            width: Screen width the columns are spread over
+            height: Screen height the columns fall through
+            columns: Number of falling characters
+            brightness_levels: Number of pre-rendered shades between dim and bright green
+            flicker: Fraction of characters that change brightness each frame
+        """
+        step = (255 - 50) / max(1, brightness_levels - 1)
+        shades = [(0, int(50 + step * level), 0) for level in range(brightness_levels)]
+        self.atlas = GlyphAtlas(font, RAIN_CHARS, shades)
+        self.flicker = flicker
+
+        levels = len(shades)
+        glyph_count = len(RAIN_CHARS)
+        self.x = array('i', (random.randint(0, width) for _ in range(columns)))
+        self.y = array('i', (random.randint(-height, 0) for _ in range(columns)))
+        self.speed = array('i', (random.randint(2, 8) for _ in range(columns)))
+        self.char = array('B', random.choices(range(glyph_count), k=columns))
+        self.level = array('B', random.choices(range(levels), k=columns))
+
+    def update(self, width: int, height: int):
+        """Advance every column one frame, recycling the ones that fell off screen."""
+        columns = len(self.y)
+        if not columns:
+            return
+        self.y = array('i', map(add, self.y, self.speed))
+
+        if max(self.y) > height:
+            glyph_count = len(self.atlas.chars)
+            for i in [i for i, y in enumerate(self.y) if y > height]:
+                self.y[i] = random.randint(-100, 0)
+                self.x[i] = random.randint(0, width)
+                self.char[i] = random.randrange(glyph_count)
+
+        # Random brightness flicker
+        count = min(columns, int(columns * self.flicker + random.random()))
+        levels = len(self.atlas.colors)
+        for i, level in zip(random.sample(range(columns), count), random.choices(range(levels), k=count)):
+            self.level[i] = level
+
+    def rects(self) -> List[pygame.Rect]:
+        """Get the screen area each character will cover when drawn."""
+        glyphs = self.atlas.glyphs
+        return [glyphs[level][char].get_rect(topleft=(x, y))
+                for x, y, char, level in zip(self.x, self.y, self.char, self.level)]
+
+    def draw(self, screen: pygame.Surface):
+        """Draw every column with a single blits call."""
+        glyphs = self.atlas.glyphs
+        screen.blits(
+            [(glyphs[level][char], (x, y)) for x, y, char, level in zip(self.x, self.y, self.char, self.level)],
+            doreturn=False
+        )
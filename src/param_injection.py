@@ -0,0 +1,160 @@
+"""AST-based parameter injection for multi_test levels."""
+import ast
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .eval_cache import CompileCache
+from .sandbox import Code
+
+# Namespace entry that carries injected values into the submission
+PARAMS_NAME = "__mp_params__"
+
+_NOT_LITERAL = object()
+
+
+class Variant(NamedTuple):
+    """One per-test version of a submission."""
+    code: Code
+    presets: Optional[Dict[str, Any]]
+
+
+class Modification(NamedTuple):
+    """A parsed code_modification such as `security_level = 3`."""
+    name: str
+    statements: List[ast.stmt]
+    value: Any
+
+
+@lru_cache(maxsize=256)
+def parse_modification(text: str) -> Modification:
+    """
+    Parse a code_modification snippet.
+
+    Raises:
+        ValueError: If the snippet doesn't assign to a plain variable
+    """
+    try:
+        statements = ast.parse(text).body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid code_modification {text!r}: {e}") from e
+
+    for statement in statements:
+        if isinstance(statement, ast.Assign) and isinstance(statement.targets[0], ast.Name):
+            name = statement.targets[0].id
+            break
+    else:
+        raise ValueError(f"code_modification must assign a variable: {text!r}")
+
+    # A lone `name = <literal>` can be injected through the namespace
+    value = _NOT_LITERAL
+    if len(statements) == 1 and len(statement.targets) == 1:
+        try:
+            value = ast.literal_eval(statement.value)
+        except (ValueError, TypeError, SyntaxError, RecursionError):
+            pass
+    return Modification(name, statements, value)
+
+
+def _assigns(statement: ast.stmt, name: str) -> bool:
+    """Check whether a statement is a plain assignment to name."""
+    if isinstance(statement, ast.Assign):
+        return any(isinstance(t, ast.Name) and t.id == name for t in statement.targets)
+    if isinstance(statement, ast.AnnAssign):
+        return isinstance(statement.target, ast.Name) and statement.target.id == name
+    return False
+
+
+def find_assignment(tree: ast.Module, name: str) -> Optional[Tuple[ast.AST, str, int]]:
+    """
+    Locate the first assignment to name, preferring module-level statements.
+
+    Returns:
+        (parent node, field name, index in that statement list), or None
+    """
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list):
+                continue
+            for index, statement in enumerate(statements):
+                if isinstance(statement, ast.stmt) and _assigns(statement, name):
+                    return node, field, index
+    return None
+
+
+def _replace_assignment(tree: ast.Module, name: str, statements: List[ast.stmt]) -> ast.Module:
+    """Copy tree with the target assignment swapped for statements."""
+    tree = copy.deepcopy(tree)
+    parent, field, index = find_assignment(tree, name)
+    body = getattr(parent, field)
+    original = body[index]
+    replacement = [copy.deepcopy(statement) for statement in statements]
+    for statement in replacement:
+        # Keep error line numbers pointing at the player's line
+        for node in ast.walk(statement):
+            ast.copy_location(node, original)
+    body[index:index + 1] = replacement
+    return ast.fix_missing_locations(tree)
+
+
+class ParameterInjector:
+    """Builds per-test variants of a submission from one parse of its source."""
+
+    def __init__(self, compile_cache: CompileCache):
+        self.compile_cache = compile_cache
+
+    def variants(self, code: str, modifications: List[Optional[str]]) -> List[Variant]:
+        """
+        Produce one variant per test case.
+
+        Literal values (`security_level = 3`) share a single compiled program
+        that reads the value from the namespace; anything else gets its own
+        tree with the assignment swapped. Code that doesn't parse, tests
+        without a modification, and code that never assigns the target run
+        unchanged.
+        """
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            return [Variant(code, None) for _ in modifications]
+
+        results = []
+        for text in modifications:
+            if not text:
+                results.append(Variant(code, None))
+                continue
+
+            modification = parse_modification(text)
+            if find_assignment(tree, modification.name) is None:
+                results.append(Variant(code, None))
+            elif modification.value is not _NOT_LITERAL:
+                results.append(Variant(
+                    self._injected(code, tree, modification.name),
+                    {PARAMS_NAME: {modification.name: modification.value}}
+                ))
+            else:
+                results.append(Variant(self._substituted(code, tree, text, modification), None))
+        return results
+
+    def _injected(self, code: str, tree: ast.Module, name: str) -> Code:
+        """Compile code with `name = __mp_params__[name]` in place of the assignment."""
+        def build():
+            lookup = ast.parse(f"{name} = {PARAMS_NAME}[{name!r}]").body
+            return compile(_replace_assignment(tree, name, lookup), "<string>", "exec")
+
+        try:
+            return self.compile_cache.compile_with(f"{code}\0param:{name}", build)
+        except (SyntaxError, ValueError):
+            return code
+
+    def _substituted(self, code: str, tree: ast.Module, text: str, modification: Modification) -> Code:
+        """Compile code with the assignment replaced by the modification's statements."""
+        def build():
+            tree_copy = _replace_assignment(tree, modification.name, modification.statements)
+            return compile(tree_copy, "<string>", "exec")
+
+        try:
+            return self.compile_cache.compile_with(f"{code}\0modify:{text}", build)
+        except (SyntaxError, ValueError):
+            return code
@@ -0,0 +1,153 @@
+"""Particle effects stored as parallel arrays and drawn from pre-rendered stamps."""
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import add
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+# Particles are drawn with a radius of life * MAX_RADIUS, at least 1 pixel
+MAX_RADIUS = 4
+# Stamps per color: one for each value of int(life * MAX_RADIUS), 0 through MAX_RADIUS
+_STAMPS_PER_COLOR = MAX_RADIUS + 1
+
+
+class ParticleSystem:
+    """
+    Structure-of-arrays particle engine.
+
+    Each attribute (position, velocity, life, color) lives in its own
+    array, so a frame's update is a handful of element-wise map() passes.
+    Every particle starts with the same life and loses it at the same rate,
+    so the arrays stay sorted by life (oldest first): dead particles are a
+    prefix dropped with one slice deletion, and the particles drawn at each
+    radius are contiguous runs found by bisection. Positions are stored as
+    the top-left corner of the particle's stamp and colors as offsets into
+    a flat stamp table, so drawing needs no per-particle arithmetic.
+    """
+
+    def __init__(self, max_particles: int = 10000, gravity: float = 0.2, decay: float = 2.0):
+        """
+        Args:
+            max_particles: Cap on live particles; the oldest are dropped beyond it
+            gravity: Added to each particle's vertical velocity every update
+            decay: Life lost per second (particles start with a life of 1.0)
+        """
+        self.max_particles = max_particles
+        self.gravity = gravity
+        self.decay = decay
+        # Top-left corner of the particle's stamp (centre - MAX_RADIUS)
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.life = array('d')
+        # Palette index * _STAMPS_PER_COLOR
+        self.color = array('H')
+        self._palette: List[Tuple[int, int, int]] = []
+        self._palette_index: Dict[Tuple[int, int, int], int] = {}
+        # _STAMPS_PER_COLOR stamps for each palette color, in palette order
+        self._stamps: List[pygame.Surface] = []
+
+    def __len__(self) -> int:
+        return len(self.life)
+
+    def _color_index(self, color) -> int:
+        """Get (adding if needed) the stamp table offset for a color."""
+        color = tuple(color[:3])
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self._palette)
+            self._palette.append(color)
+            self._palette_index[color] = index
+        return index * _STAMPS_PER_COLOR
+
+    def spawn(self, x: float, y: float, count: int, color, speed: float = 3.0):
+        """
+        Spawn a burst of particles flying out from a point.
+
+        Args:
+            x: Burst X position
+            y: Burst Y position
+            count: Number of particles
+            color: RGB color of the particles
+            speed: Maximum initial speed along each axis
+        """
+        uniform = random.uniform
+        self.x.extend([x - MAX_RADIUS] * count)
+        self.y.extend([y - MAX_RADIUS] * count)
+        self.vx.extend([uniform(-speed, speed) for _ in range(count)])
+        self.vy.extend([uniform(-speed, speed) for _ in range(count)])
+        self.life.extend([1.0] * count)
+        self.color.extend([self._color_index(color)] * count)
+
+        excess = len(self.life) - self.max_particles
+        if excess > 0:
+            # Oldest first, since particles are appended in spawn order
+            for values in self._arrays():
+                del values[:excess]
+
+    def _arrays(self) -> Tuple[array, ...]:
+        return self.x, self.y, self.vx, self.vy, self.life, self.color
+
+    def update(self, dt: float):
+        """Move every particle, apply gravity and age them, dropping dead ones."""
+        if not self.life:
+            return
+        self.x = array('d', map(add, self.x, self.vx))
+        self.y = array('d', map(add, self.y, self.vy))
+        self.vy = array('d', map(self.gravity.__add__, self.vy))
+        self.life = array('d', map((-dt * self.decay).__add__, self.life))
+
+        dead = bisect_right(self.life, 0.0)
+        if dead:
+            for values in self._arrays():
+                del values[:dead]
+
+    def _build_stamps(self):
+        """
+        Pre-render circle stamps for palette colors that don't have them yet.
+
+        Every stamp is the same size with the circle centred, so all
+        particles share one blit offset.
+        """
+        size = MAX_RADIUS * 2
+        while len(self._stamps) < len(self._palette) * _STAMPS_PER_COLOR:
+            color = self._palette[len(self._stamps) // _STAMPS_PER_COLOR]
+            for level in range(_STAMPS_PER_COLOR):
+                stamp = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.circle(stamp, color, (MAX_RADIUS, MAX_RADIUS), max(1, level))
+                self._stamps.append(stamp)
+
+    def _radius_levels(self) -> List[int]:
+        """Get int(life * MAX_RADIUS) for every particle, built from the sorted life runs."""
+        levels = []
+        start = 0
+        for level in range(MAX_RADIUS):
+            end = bisect_left(self.life, (level + 1) / MAX_RADIUS, start)
+            levels += [level] * (end - start)
+            start = end
+        levels += [MAX_RADIUS] * (len(self.life) - start)
+        return levels
+
+    def draw(self, screen: pygame.Surface):
+        """Draw every particle with a single Surface.fblits call."""
+        if not self.life:
+            return
+        self._build_stamps()
+        stamps = map(self._stamps.__getitem__, map(add, self.color, self._radius_levels()))
+        screen.fblits(zip(stamps, zip(self.x, self.y)))
+
+    def bounds(self) -> Optional[pygame.Rect]:
+        """Get a rect covering every particle, or None if there are none."""
+        if not self.life:
+            return None
+        left, top = int(min(self.x)), int(min(self.y))
+        size = MAX_RADIUS * 2 + 1
+        return pygame.Rect(left, top, int(max(self.x)) - left + size, int(max(self.y)) - top + size)
+
+    def clear(self):
+        """Remove every particle."""
+        for values in self._arrays():
+            del values[:]
@@ -0,0 +1,49 @@
+"""Caches of pre-rendered surfaces reused across frames."""
+import pygame
+
+from .eval_cache import LRUCache
+
+
+class GlowTextCache(LRUCache):
+    """
+    Caches glow text pre-composited into a single surface.
+
+    A glow is the text rendered in a darker color at every offset within
+    glow_size pixels, with the text itself on top. Building that takes one
+    blit per offset, so it is done once per (text, font, color, glow_size)
+    and every later frame costs a single blit.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        super().__init__(maxsize)
+
+    def render(self, text: str, font: pygame.font.Font, color, glow_size: int) -> pygame.Surface:
+        """
+        Get the composited glow surface for a piece of text.
+
+        The text's top-left corner sits at (glow_size, glow_size) in the
+        returned surface.
+        """
+        color = tuple(color)
+        key = (text, font, color, glow_size)
+        surface = self.get(key)
+        if surface is None:
+            surface = self._composite(text, font, color, glow_size)
+            self.put(key, surface)
+        return surface
+
+    @staticmethod
+    def _composite(text: str, font: pygame.font.Font, color, glow_size: int) -> pygame.Surface:
+        """Render the glow and the text once and combine them."""
+        main_text = font.render(text, True, color)
+        width, height = main_text.get_size()
+        surface = pygame.Surface((width + 2 * glow_size, height + 2 * glow_size), pygame.SRCALPHA)
+
+        glow_color = (color[0] // 3, color[1] // 3, color[2] // 3)
+        glow_text = font.render(text, True, glow_color)
+        for offset_x in range(-glow_size, glow_size + 1):
+            for offset_y in range(-glow_size, glow_size + 1):
+                if offset_x != 0 or offset_y != 0:
+                    surface.blit(glow_text, (glow_size + offset_x, glow_size + offset_y))
+        surface.blit(main_text, (glow_size, glow_size))
+        return surface
@@ -0,0 +1,699 @@
+"""Execution backends that run player code for the CodeEvaluator."""
+import io
+import builtins
+import contextlib
+import copy
+import marshal
+import math
+import multiprocessing
+import queue
+import random
+import signal
+import sys
+import threading
+import time
+from types import CodeType, FunctionType, MappingProxyType, MethodType, ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .virtual_fs import VirtualFileSystem, FixtureSpec
+from .checkers import Checker
+from .eval_cache import LRUCache
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# (success, output, error, checker verdict) as produced by run_code
+ExecutionOutcome = Tuple[bool, str, Optional[str], Optional[bool]]
+
+# Errors caused by limits or worker trouble rather than by the code alone
+TRANSIENT_ERRORS = ("CPUTimeExceeded", "TimeoutError", "MemoryError", "WorkerCrashed", "WorkerUnavailable")
+
+# Source text or an already compiled module code object
+Code = Union[str, CodeType]
+
+
+class ExecutionInterrupted(BaseException):
+    """Base for sandbox aborts; derives from BaseException so `except Exception` in player code can't swallow it."""
+
+
+class CPUTimeExceeded(ExecutionInterrupted):
+    """Raised inside a worker when a submission uses up its CPU time budget."""
+
+
+class OutputLimitExceeded(ExecutionInterrupted):
+    """Raised when a submission prints more than its output budget."""
+
+
+class VerdictReached(ExecutionInterrupted):
+    """Raised to stop a run as soon as an incremental checker is certain the output fails."""
+
+    def __init__(self, passed: bool):
+        super().__init__("checker verdict reached")
+        self.passed = passed
+
+
+# Default output budget per run
+MAX_OUTPUT_CHARS = 100_000
+MAX_OUTPUT_LINES = 5_000
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    Stand-in for stdout that enforces an output budget.
+
+    Output past max_chars characters or max_lines lines is cut off and
+    the run is aborted with OutputLimitExceeded. Every accepted chunk is
+    also passed to on_write, so callers can show output while the code is
+    still running.
+    """
+
+    def __init__(self, max_chars: Optional[int] = MAX_OUTPUT_CHARS,
+                 max_lines: Optional[int] = MAX_OUTPUT_LINES,
+                 on_write: Optional[Callable[[str], None]] = None):
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.on_write = on_write
+        self.chars = 0
+        self.lines = 0
+        self._parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+
+        accepted = text
+        exceeded = None
+        if self.max_chars is not None and self.chars + len(accepted) > self.max_chars:
+            accepted = accepted[:self.max_chars - self.chars]
+            exceeded = f"output exceeded {self.max_chars} characters"
+        if self.max_lines is not None:
+            newlines = accepted.count("\n")
+            if self.lines + newlines > self.max_lines:
+                # Keep everything up to and including the last allowed newline
+                cut = -1
+                for _ in range(self.max_lines - self.lines):
+                    cut = accepted.index("\n", cut + 1)
+                accepted = accepted[:cut + 1]
+                exceeded = f"output exceeded {self.max_lines} lines"
+
+        if accepted:
+            self._parts.append(accepted)
+            self.chars += len(accepted)
+            self.lines += accepted.count("\n")
+            if self.on_write:
+                self.on_write(accepted)
+        if exceeded:
+            raise OutputLimitExceeded(exceeded)
+        return len(text)
+
+    def getvalue(self) -> str:
+        """Get everything written so far."""
+        return "".join(self._parts)
+
+
+class NamespaceSpec:
+    """
+    A level's namespace setup: modules to preload and setup code to snapshot.
+
+    Hashable and picklable, so workers can cache the namespace it builds.
+    """
+
+    __slots__ = ("preload", "setup_code")
+
+    def __init__(self, preload=(), setup_code: Optional[str] = None):
+        self.preload = tuple(preload)
+        self.setup_code = setup_code or None
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, NamespaceSpec)
+                and (self.preload, self.setup_code) == (other.preload, other.setup_code))
+
+    def __hash__(self) -> int:
+        return hash((self.preload, self.setup_code))
+
+    def __getstate__(self):
+        return self.preload, self.setup_code
+
+    def __setstate__(self, state):
+        self.preload, self.setup_code = state
+
+
+class BaseNamespace:
+    """
+    Immutable snapshot of a level's namespace after its setup has run.
+
+    fresh() turns it into a namespace for a single run without running the
+    setup again: modules are shallow-copied, other values deep-copied, and
+    functions the setup code defined are rebound to the run's namespace so
+    they see that run's globals (its seeded `random`, its files). Nothing
+    one run changes is seen by the next. Classes the setup defined are
+    shared, so their methods still see the snapshot's globals.
+    """
+
+    def __init__(self, values: Dict[str, Any], setup_globals: Optional[Dict[str, Any]] = None):
+        self.values = MappingProxyType(values)
+        self.modules = tuple(name for name, value in values.items() if isinstance(value, ModuleType))
+        self.functions = tuple(name for name, value in values.items()
+                               if isinstance(value, FunctionType) and setup_globals is not None
+                               and value.__globals__ is setup_globals)
+
+    def fresh(self) -> Dict[str, Any]:
+        """Get a new namespace dict for a single run."""
+        namespace = {}
+        # deepcopy memo: data that refers to a module or helper gets this run's version of it
+        memo = {}
+        for name in self.modules:
+            module = self.values[name]
+            memo[id(module)] = _module_copy(module)
+        for name in self.functions:
+            function = self.values[name]
+            memo[id(function)] = _rebind(function, namespace, memo)
+        for name, value in self.values.items():
+            copied = memo.get(id(value))
+            if copied is None:
+                try:
+                    copied = copy.deepcopy(value, memo)
+                except Exception:
+                    # Not copyable (e.g. a generator); runs share it
+                    copied = value
+            namespace[name] = copied
+        return namespace
+
+
+def _module_copy(module: ModuleType) -> ModuleType:
+    """Copy a module's attributes into a new module object, so assigning to them stays local."""
+    copied = ModuleType(module.__name__, module.__doc__)
+    copied.__dict__.update(vars(module))
+    return copied
+
+
+def _rebind(function: FunctionType, namespace: Dict[str, Any], memo: Dict[int, Any]) -> FunctionType:
+    """Copy a function so it looks up its globals in namespace, with its own copy of its defaults."""
+    rebound = FunctionType(function.__code__, namespace, function.__name__,
+                           copy.deepcopy(function.__defaults__, memo), function.__closure__)
+    rebound.__kwdefaults__ = copy.deepcopy(function.__kwdefaults__, memo)
+    rebound.__qualname__ = function.__qualname__
+    rebound.__doc__ = function.__doc__
+    rebound.__dict__.update(function.__dict__)
+    return rebound
+
+
+# Every run's namespace starts from this, plus the level's own setup
+_DEFAULT_NAMESPACE = BaseNamespace({'random': random})  # Allow random module
+# Base namespaces already built in this process, keyed by NamespaceSpec
+_base_namespaces = LRUCache(32)
+# Seed for the `random` the setup code sees, so every worker builds the same snapshot
+SETUP_SEED = 0
+
+
+def base_namespace(spec: Optional[NamespaceSpec]) -> BaseNamespace:
+    """
+    Get the base namespace for a level, building it on first use in this process.
+
+    Building imports the preloads and runs the setup code (output
+    discarded, `random` seeded with SETUP_SEED) once; later runs only copy
+    the snapshot (see BaseNamespace.fresh).
+
+    Raises:
+        Exception: Whatever a preload import or the setup code raised
+    """
+    if spec is None:
+        return _DEFAULT_NAMESPACE
+    base = _base_namespaces.get(spec)
+    if base is None:
+        values = dict(_DEFAULT_NAMESPACE.values)
+        for module in spec.preload:
+            # Binds the top-level package, like an import statement
+            values[module.split(".")[0]] = __import__(module)
+        setup_globals = None
+        if spec.setup_code:
+            # Level content is trusted and runs with the real builtins
+            setup_globals = dict(values, random=random_module(SETUP_SEED))
+            with contextlib.redirect_stdout(io.StringIO()):
+                exec(compile(spec.setup_code, "<level setup>", "exec"), setup_globals)
+            setup_globals.pop("__builtins__", None)
+            values = setup_globals
+        base = BaseNamespace(dict(values), setup_globals)
+        _base_namespaces.put(spec, base)
+    return base
+
+
+# Module-level attributes of `random` (classes, constants) and the functions bound to its hidden instance
+_RANDOM_ATTRS = {name: value for name, value in vars(random).items() if not name.startswith("_")}
+_RANDOM_METHODS = tuple(name for name, value in _RANDOM_ATTRS.items()
+                        if isinstance(value, MethodType) and isinstance(value.__self__, random.Random))
+
+
+def random_module(seed: Optional[int]) -> ModuleType:
+    """
+    Build a stand-in `random` module backed by its own Random instance.
+
+    Every run gets one, so runs never share RNG state; a seed makes the
+    run reproducible, None seeds from system entropy.
+    """
+    rng = random.Random(seed)
+    module = ModuleType("random", random.__doc__)
+    module.__dict__.update(_RANDOM_ATTRS)
+    for name in _RANDOM_METHODS:
+        setattr(module, name, getattr(rng, name))
+    return module
+
+
+def _sandbox_import(modules: Dict[str, ModuleType]) -> Callable[..., Any]:
+    """Build an `__import__` builtin that hands out this run's own module objects (e.g. random)."""
+    real_import = builtins.__import__
+
+    def sandbox_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in modules:
+            return modules[name]
+        return real_import(name, globals, locals, fromlist, level)
+
+    return sandbox_import
+
+
+def _stdin_input(stdin: Optional[str]) -> Callable[..., str]:
+    """Build an `input` builtin that reads lines from stdin text instead of the real stdin."""
+    lines = io.StringIO(stdin or "")
+
+    def sandbox_input(prompt=""):
+        if prompt:
+            sys.stdout.write(str(prompt))
+        line = lines.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line[:-1] if line.endswith("\n") else line
+
+    return sandbox_input
+
+
+def run_code(code: Code, required_file: FixtureSpec = None,
+             presets: Optional[Dict[str, Any]] = None,
+             max_output: Optional[int] = MAX_OUTPUT_CHARS,
+             max_lines: Optional[int] = MAX_OUTPUT_LINES,
+             on_output: Optional[Callable[[str], None]] = None,
+             checker: Optional[Checker] = None,
+             stdin: Optional[str] = None,
+             namespace_spec: Optional[NamespaceSpec] = None,
+             seed: Optional[int] = None) -> ExecutionOutcome:
+    """
+    Execute Python code in the current process and capture its output.
+
+    Args:
+        code: The Python code (source or compiled) to execute
+        required_file: Optional fixture dict (or list of them) with 'filename' and 'content',
+            served to the code from memory through `open`
+        presets: Optional extra names to place in the code's namespace
+        max_output: Output budget in characters (None for unlimited)
+        max_lines: Output budget in lines (None for unlimited)
+        on_output: Optional callback receiving output chunks as they are printed
+        checker: Optional compiled checker; if it can judge output incrementally,
+            the run stops as soon as the output is certain to fail
+        stdin: Text that `input()` reads from (reading past it raises EOFError)
+        namespace_spec: Optional level setup; its base namespace is built once per process
+            and copied for this run
+        seed: Seed for this run's private `random` module (None for an unseeded one)
+
+    Returns:
+        Tuple of (success, output, error, verdict); verdict is False if the
+        checker failed the output early, the stream's finish() result after a
+        clean exit, otherwise None
+    """
+    # Files live in memory for this run only
+    try:
+        vfs = VirtualFileSystem.from_fixtures(required_file)
+    except Exception as e:
+        return False, "", f"Error creating file: {e}", None
+
+    try:
+        base = base_namespace(namespace_spec)
+    except Exception as e:
+        return False, "", f"Level setup failed: {type(e).__name__}: {e}", None
+
+    sandbox_builtins = dict(builtins.__dict__)
+    sandbox_builtins['open'] = vfs.open
+    # Never block on the real stdin; tests provide their own input text
+    sandbox_builtins['input'] = _stdin_input(stdin)
+
+    namespace = base.fresh()
+    namespace['__builtins__'] = sandbox_builtins
+    # `random` and `import random` both get this run's own generator, and
+    # importing a preloaded module gives this run's copy of it
+    modules = {name: namespace[name] for name in base.modules}
+    modules['random'] = namespace['random'] = random_module(seed)
+    sandbox_builtins['__import__'] = _sandbox_import(modules)
+
+    # Judge output as it is printed when the checker supports it
+    stream = checker.stream() if checker is not None else None
+    if stream is not None:
+        listener = on_output
+
+        def on_output(chunk):
+            if listener:
+                listener(chunk)
+            # Only failures are certain mid-run; a pass still needs a clean exit
+            if stream.feed(chunk) is False:
+                raise VerdictReached(False)
+
+    # Capture stdout
+    output_buffer = BoundedOutput(max_output, max_lines, on_output)
+    error_msg = None
+    success = False
+    verdict = None
+
+    try:
+        # Execute the code with captured stdout
+        with contextlib.redirect_stdout(output_buffer):
+            if presets:
+                namespace.update(presets)
+            exec(code, namespace)
+        success = True
+        if stream is not None:
+            verdict = stream.finish()
+    except VerdictReached as e:
+        success = True
+        verdict = e.passed
+    except (Exception, ExecutionInterrupted) as e:
+        error_msg = f"{type(e).__name__}: {str(e)}"
+
+    return success, output_buffer.getvalue(), error_msg, verdict
+
+
+class InProcessBackend:
+    """Runs code with exec inside the game process (no isolation, no time or memory limits)."""
+
+    # redirect_stdout swaps the process-wide sys.stdout, so only one run at a time
+    parallelism = 1
+
+    def __init__(self, max_output: Optional[int] = MAX_OUTPUT_CHARS,
+                 max_lines: Optional[int] = MAX_OUTPUT_LINES):
+        self.max_output = max_output
+        self.max_lines = max_lines
+
+    def execute(self, code: Code, required_file: FixtureSpec = None,
+                presets: Optional[Dict[str, Any]] = None,
+                on_output: Optional[Callable[[str], None]] = None,
+                checker: Optional[Checker] = None,
+                stdin: Optional[str] = None,
+                namespace_spec: Optional[NamespaceSpec] = None,
+                seed: Optional[int] = None) -> ExecutionOutcome:
+        """Execute code directly in this process."""
+        return run_code(code, required_file, presets, self.max_output, self.max_lines,
+                        on_output, checker, stdin, namespace_spec, seed)
+
+    def shutdown(self):
+        """Nothing to release."""
+        pass
+
+
+def _apply_memory_limit(memory_mb: Optional[int]):
+    """Cap the worker's address space so a memory hog raises MemoryError."""
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _on_cpu_exceeded(signum, frame):
+    raise CPUTimeExceeded("CPU time limit exceeded")
+
+
+@contextlib.contextmanager
+def _cpu_limit(seconds: Optional[float]):
+    """Allow the current job `seconds` more CPU time via the soft RLIMIT_CPU."""
+    if resource is None or not seconds or not hasattr(signal, "SIGXCPU"):
+        yield
+        return
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(math.ceil(used + seconds))
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    # Only the soft limit moves: an unprivileged process can never raise its hard limit again
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _send_message(conn, message):
+    """Send on the pipe with SIGXCPU held back so a CPU-limit abort can't cut a message in half."""
+    if hasattr(signal, "pthread_sigmask") and hasattr(signal, "SIGXCPU"):
+        previous = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGXCPU})
+        try:
+            conn.send(message)
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+    else:
+        conn.send(message)
+
+
+class _OutputStreamer:
+    """
+    Batches a worker's output into ("output", text) pipe messages.
+
+    A batch is sent as soon as it reaches min_chars, and a background
+    thread sends whatever is pending every `interval` seconds, so output
+    printed before a long computation or a sleep still arrives promptly.
+    """
+
+    def __init__(self, conn, min_chars: int = 4096, interval: float = 0.05):
+        self.conn = conn
+        self.min_chars = min_chars
+        self.interval = interval
+        self._pending = []
+        self._pending_chars = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+
+    def write(self, text: str):
+        with self._lock:
+            self._pending.append(text)
+            self._pending_chars += len(text)
+            if self._pending_chars >= self.min_chars:
+                self._send_pending()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                return
+
+    def _send_pending(self):
+        if self._pending:
+            _send_message(self.conn, ("output", "".join(self._pending)))
+            self._pending = []
+            self._pending_chars = 0
+
+    def flush(self):
+        with self._lock:
+            self._send_pending()
+
+    def close(self):
+        """Stop the background thread and send anything still pending."""
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+
+
+def _worker_main(conn, cpu_time: Optional[float], memory_mb: Optional[int],
+                 max_output: Optional[int], max_lines: Optional[int]):
+    """Entry point of a pool worker: run jobs from the pipe until told to stop."""
+    # Leave Ctrl+C handling to the game process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_cpu_exceeded)
+    _apply_memory_limit(memory_mb)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        code, required_file, presets, checker, stdin, namespace_spec, seed = job
+        if isinstance(code, bytes):
+            code = marshal.loads(code)
+        try:
+            # Build the level's snapshot outside the player's CPU budget (cached after the first run)
+            base_namespace(namespace_spec)
+        except Exception:
+            pass  # run_code reports it
+        # Output is always streamed, so the parent keeps it even if the run times out
+        streamer = _OutputStreamer(conn)
+        try:
+            with _cpu_limit(cpu_time):
+                outcome = run_code(code, required_file, presets, max_output, max_lines,
+                                   streamer.write, checker, stdin, namespace_spec, seed)
+        except CPUTimeExceeded as e:
+            # Signal arrived outside exec (e.g. while restoring the limit)
+            outcome = (False, "", f"{type(e).__name__}: {e}", None)
+
+        try:
+            streamer.close()
+            _send_message(conn, ("done", outcome))
+        except (OSError, ValueError):
+            break
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class ProcessPoolBackend:
+    """
+    Runs code in a pool of pre-started worker processes.
+
+    Each worker enforces a CPU-time and memory limit on itself (where the
+    platform supports it). A worker that misses the wall-clock timeout or
+    dies is killed and replaced in the background, so the caller gets an
+    error result back instead of hanging.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 5.0,
+                 cpu_time: Optional[float] = 3.0, memory_mb: Optional[int] = 256,
+                 max_output: Optional[int] = MAX_OUTPUT_CHARS,
+                 max_lines: Optional[int] = MAX_OUTPUT_LINES):
+        self.parallelism = max(1, workers)
+        self.timeout = timeout
+        self.cpu_time = cpu_time
+        self.memory_mb = memory_mb
+        self.max_output = max_output
+        self.max_lines = max_lines
+
+        methods = multiprocessing.get_all_start_methods()
+        if "forkserver" in methods:
+            # Fork from a clean server process, never from the threaded game process
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload([__name__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Per-thread total of time spent waiting for a free worker
+        self._waits = threading.local()
+        for _ in range(self.parallelism):
+            self._idle.put(self._spawn_worker())
+
+    def _spawn_worker(self) -> _Worker:
+        """Start a new worker process."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.cpu_time, self.memory_mb, self.max_output, self.max_lines),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _replace_worker(self, worker: _Worker):
+        """Kill a hung or crashed worker and start a fresh one off the calling thread."""
+        def replace():
+            worker.process.kill()
+            worker.process.join()
+            worker.conn.close()
+            with self._lock:
+                if self._closed:
+                    return
+            try:
+                self._idle.put(self._spawn_worker())
+            except Exception as e:
+                print(f"Error starting evaluation worker: {e}")
+
+        threading.Thread(target=replace, daemon=True).start()
+
+    def execute(self, code: Code, required_file: FixtureSpec = None,
+                presets: Optional[Dict[str, Any]] = None,
+                on_output: Optional[Callable[[str], None]] = None,
+                checker: Optional[Checker] = None,
+                stdin: Optional[str] = None,
+                namespace_spec: Optional[NamespaceSpec] = None,
+                seed: Optional[int] = None) -> ExecutionOutcome:
+        """Execute code in the next free worker, passing streamed output to on_output."""
+        # Code objects can't be pickled, but marshal round-trips them between identical interpreters
+        if isinstance(code, CodeType):
+            code = marshal.dumps(code)
+
+        waiting_since = time.perf_counter()
+        try:
+            # Allow time for a replacement worker to start
+            worker = self._idle.get(timeout=self.timeout + 10)
+        except queue.Empty:
+            return False, "", "WorkerUnavailable: no evaluation worker is available", None
+        finally:
+            self._waits.total = self.wait_time() + time.perf_counter() - waiting_since
+
+        streamed = []
+        try:
+            worker.conn.send((code, required_file, presets, checker, stdin, namespace_spec, seed))
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    error = f"TimeoutError: execution took longer than {self.timeout:g}s"
+                    break
+                kind, payload = worker.conn.recv()
+                if kind == "output":
+                    streamed.append(payload)
+                    if on_output is not None:
+                        try:
+                            on_output(payload)
+                        except Exception as e:
+                            print(f"Error in output listener: {e}")
+                    continue
+                self._idle.put(worker)
+                return payload
+        except (EOFError, OSError):
+            error = "WorkerCrashed: the program was terminated (out of memory?)"
+
+        self._replace_worker(worker)
+        # Output streamed before the worker was lost is all we have
+        return False, "".join(streamed), error, None
+
+    def wait_time(self) -> float:
+        """Get the total seconds the calling thread has spent waiting for a free worker."""
+        return getattr(self._waits, "total", 0.0)
+
+    def shutdown(self):
+        """Stop all idle workers."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.conn.close()
@@ -26,6 +26,16 @@ class GameplayScene:
         self.timeout_message = ""
         self.timeout_restart_rect = None
         self.timeout_menu_rect = None
+        self.pending_run = None
+        self.pending_level_id = None
+        # Level time when the in-flight run was submitted
+        self.pending_submitted_at = 0
+        self.run_progress = (0, 0)
+        self.run_elapsed = 0
+        self.running_text = ""
+        self.live_output = ""
+        self.level_generation = 0
+        self.loaded_starter_code = ""
     
     def setup(self, preserve_timer=False):
         """Initialize the gameplay scene."""
@@ -36,6 +46,10 @@ class GameplayScene:
         # Reset completion state
         self.level_completed = False
         
+        # Drop any evaluation still running for the previous level (kept across resize/resume)
+        if not preserve_timer:
+            self._discard_pending_run()
+        
         # Reset timeout overlay state
         self.timeout_overlay = False
         self.timeout_message = ""
@@ -86,6 +100,10 @@ class GameplayScene:
         
         self.code_textbox.set_text(self.game.game_state.user_code)
         
+        # Remember what was loaded so hot-reloaded level edits can be detected
+        self.level_generation = self.game.game_state.level_loader.generation
+        self.loaded_starter_code = level.starter_code
+        
         # Run button
         self.run_button = pygame_gui.elements.UIButton(
             relative_rect=pygame.Rect((520, 560), (150, 40)),
@@ -135,6 +153,11 @@ class GameplayScene:
             text="",
             manager=self.game.ui_manager
         )
+        
+        # Rebuilt while a run is still in flight
+        if self.pending_run is not None:
+            self.run_button.disable()
+            self.running_text = ""
     
     def handle_event(self, event):
         """Handle events for gameplay scene."""
@@ -151,6 +174,7 @@ class GameplayScene:
                 self._next_level()
 
             elif event.ui_element == self.back_button:
+                self._discard_pending_run()
                 self.game.game_state.stop_timer()
                 self.game.change_scene(GameScene.LEVEL_SELECT)
         
@@ -161,6 +185,7 @@ class GameplayScene:
                 if self.timeout_restart_rect and self.timeout_restart_rect.collidepoint(mouse_pos):
                     self._restart_level()
                 elif self.timeout_menu_rect and self.timeout_menu_rect.collidepoint(mouse_pos):
+                    self._discard_pending_run()
                     self.game.game_state.stop_timer()
                     self.game.change_scene(GameScene.LEVEL_SELECT)
         
@@ -187,12 +212,87 @@ class GameplayScene:
         if self.game.game_state.is_time_up():
             return
         
-        # Evaluate the code
-        success, message = self.game.game_state.evaluator.evaluate_level(user_code, level)
+        # Ignore repeated presses while a run is in flight
+        if self.pending_run is not None:
+            return
+        
+        # Evaluate the code in the background; update() picks up the result.
+        # The clock keeps running, but the result is judged by the time it
+        # was submitted, so a run still in flight at the deadline counts.
+        self.pending_submitted_at = self.game.game_state.elapsed_time
+        self.run_progress = (0, 0)
+        self.run_elapsed = 0
+        self.running_text = ""
+        self.live_output = ""
+        self.pending_level_id = level.id
+        self.pending_run = self.game.game_state.evaluator.submit_level(
+            user_code, level, progress=self._on_run_progress, on_output=self._on_run_output
+        )
+        self.run_button.disable()
+        self._update_running_label()
+    
+    def _on_run_progress(self, done, total):
+        """Record test progress (called from the evaluation thread)."""
+        self.run_progress = (done, total)
+    
+    def _on_run_output(self, chunk):
+        """Keep the tail of the program's output (called from the evaluation thread)."""
+        self.live_output = (self.live_output + chunk)[-500:]
+    
+    def _update_running_label(self):
+        """Show the running state, per-test progress and latest output in the result label."""
+        done, total = self.run_progress
+        dots = "." * (int(self.run_elapsed * 3) % 4)
+        text = f"RUNNING{dots:<3} ({self.run_elapsed:.1f}s)"
+        if total > 1:
+            text += f" | Tests passed: {done}/{total}"
+        output_lines = [line for line in self.live_output.split('\n') if line.strip()]
+        if output_lines:
+            text += f" | > {output_lines[-1][:60]}"
+        if text != self.running_text:
+            self.running_text = text
+            self.result_label.set_text(text)
+    
+    def _discard_pending_run(self):
+        """Forget the in-flight evaluation; its result will be ignored."""
+        if self.pending_run is not None:
+            self.pending_run.cancel()
+            self.pending_run = None
+            self.pending_level_id = None
+        if self.run_button is not None:
+            self.run_button.enable()
+    
+    def _poll_pending_run(self, dt):
+        """Check on the background evaluation and apply its result when ready."""
+        if self.pending_run is None:
+            return
+        
+        if not self.pending_run.done():
+            self.run_elapsed += dt
+            self._update_running_label()
+            return
+        
+        future = self.pending_run
+        level_id = self.pending_level_id
+        self.pending_run = None
+        self.pending_level_id = None
+        self.run_button.enable()
         
+        # Player moved on while the code was running
+        if level_id != self.game.game_state.current_level_id or self.timeout_overlay:
+            return
+        
+        try:
+            success, message = future.result()
+        except Exception as e:
+            success, message = False, f"Error: {type(e).__name__}: {e}"
+        self._show_run_result(success, message, self.pending_submitted_at)
+    
+    def _show_run_result(self, success, message, submitted_at=None):
+        """Apply the outcome of an evaluation to the scene (scored by the level time it was submitted at)."""
         if success:
             self.level_completed = True
-            points_earned, penalty = self.game.game_state.complete_current_level()
+            points_earned, penalty = self.game.game_state.complete_current_level(submitted_at)
             
             import random
             success_msgs = [
@@ -323,6 +423,7 @@ class GameplayScene:
             return
         
         # Reset level state
+        self._discard_pending_run()
         self.code_textbox.set_text(level.starter_code)
         self.game.game_state.user_code = level.starter_code
         self.game.game_state.current_hint_index = 0
@@ -350,10 +451,35 @@ class GameplayScene:
             # No more levels - go to victory
             self.game.change_scene(GameScene.VICTORY)
     
+    def _check_level_reload(self):
+        """Pick up edits to the current level's file (dev mode hot reload)."""
+        loader = self.game.game_state.level_loader
+        if loader.generation == self.level_generation:
+            return
+        self.level_generation = loader.generation
+        
+        # Title, mission log and checker are read from the level on use; only the editor needs help
+        level = self.game.game_state.get_current_level()
+        if not level or level.starter_code == self.loaded_starter_code:
+            return
+        
+        # Don't throw away code the player has already written
+        if self.code_textbox.get_text() == self.loaded_starter_code:
+            self.code_textbox.set_text(level.starter_code)
+            self.game.game_state.user_code = level.starter_code
+            if self.pending_run is None:
+                self.result_label.set_text("Level reloaded.")
+        self.loaded_starter_code = level.starter_code
+    
     def update(self, dt):
         """Update gameplay scene."""
-        # Check if time is up (not during level completion)
-        if not self.level_completed and not self.timeout_overlay and self.game.game_state.is_time_up():
+        self._poll_pending_run(dt)
+        self._check_level_reload()
+        
+        # Check if time is up (not during level completion, and not before
+        # the result of a run submitted in time is in)
+        if (not self.level_completed and not self.timeout_overlay and self.pending_run is None
+                and self.game.game_state.is_time_up()):
             self.timeout_overlay = True
             self.timeout_message = self.game.game_state.get_time_up_message()
             self.flash_screen = True
@@ -475,22 +601,7 @@ class GameplayScene:
         )
         
         # Draw troll message (word wrap)
-        words = troll_msg.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            test_surface = self.game.text_font.render(test_line, True, self.game.GREEN)
-            if test_surface.get_width() <= box_width - 80:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line.strip())
-                current_line = word + " "
-        
-        if current_line:
-            lines.append(current_line.strip())
+        lines = self.game.text_layout.wrap(troll_msg, self.game.text_font, box_width - 80)
         
         # Draw lines
         line_y = box_y + 140
@@ -553,27 +664,8 @@ class GameplayScene:
         self.game.draw_glow_text(screen, title, (x + 10, y + 5), self.game.text_font, self.game.BRIGHT_GREEN, glow_size=1, center=False)
         
         # Draw text (word wrap)
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            test_surface = self.game.text_font.render(test_line, True, self.game.GREEN)
-            if test_surface.get_width() <= width - 20:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word + " "
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # Draw lines
         line_y = y + 30
-        for line in lines:
-            line_surface = self.game.text_font.render(line.strip(), True, self.game.GREEN)
+        for line_surface in self.game.text_layout.render(text, self.game.text_font, self.game.GREEN, width - 20):
             screen.blit(line_surface, (x + 10, line_y))
             line_y += 20
             if line_y > y + height - 10:
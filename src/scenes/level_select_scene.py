@@ -28,7 +28,7 @@ class LevelSelectScene:
             self.quit_button.kill()
         
         # Create level buttons in a grid
-        levels = self.game.game_state.get_all_levels()
+        levels = self.game.game_state.get_level_entries()
         
         cols = 5
         rows = (len(levels) + cols - 1) // cols
@@ -109,8 +109,11 @@ class LevelSelectScene:
     
     def draw(self, screen):
         """Draw level select scene."""
-        import math
-        
+        self.draw_background(screen)
+        self.draw_dynamic(screen)
+    
+    def draw_background(self, screen):
+        """Draw the parts of the scene that only change on setup (cached in dirty-rect mode)."""
         # Draw glowing header
         header_x = self.game.SCREEN_WIDTH // 2
         self.game.draw_glow_text(
@@ -133,6 +136,18 @@ class LevelSelectScene:
             self.game.GREEN,
             glow_size=1
         )
+    
+    def draw_dynamic(self, screen):
+        """
+        Draw the pulsing progress bar.
+        
+        Returns:
+            The rects drawn to
+        """
+        import math
+        
+        total_levels = self.game.game_state.level_loader.get_level_count()
+        completed = len(self.game.game_state.completed_levels)
         
         # Draw enhanced progress bar
         bar_width = 400
@@ -145,7 +160,7 @@ class LevelSelectScene:
         glow_surface = pygame.Surface((bar_width + 10, bar_height + 10))
         glow_surface.set_alpha(glow_alpha)
         glow_surface.fill(self.game.DARK_GREEN)
-        screen.blit(glow_surface, (bar_x - 5, bar_y - 5))
+        bar_rect = screen.blit(glow_surface, (bar_x - 5, bar_y - 5))
         
         # Draw double border
         pygame.draw.rect(screen, self.game.DARK_GREEN, (bar_x, bar_y, bar_width, bar_height), 2)
@@ -165,3 +180,5 @@ class LevelSelectScene:
             pygame.draw.line(screen, self.game.BRIGHT_GREEN, (bar_x, bar_y), (bar_x, bar_y + corner_size), 2)
             pygame.draw.line(screen, self.game.BRIGHT_GREEN, (bar_x + bar_width, bar_y), (bar_x + bar_width - corner_size, bar_y), 2)
             pygame.draw.line(screen, self.game.BRIGHT_GREEN, (bar_x + bar_width, bar_y), (bar_x + bar_width, bar_y + corner_size), 2)
+        
+        return [bar_rect]
@@ -75,12 +75,22 @@ class SettingsScene:
     
     def draw(self, screen):
         """Draw settings scene."""
+        self.draw_background(screen)
+        self.draw_dynamic(screen)
+    
+    def draw_dynamic(self, screen):
+        """
+        Draw the pulsing title.
+        
+        Returns:
+            The rects drawn to
+        """
         import math
         
         # Draw glowing pulsing title
         pulse = math.sin(self.pulse_timer)
         pulse_size = int(2 + pulse)
-        self.game.draw_glow_text(
+        title_rect = self.game.draw_glow_text(
             screen,
             "SETTINGS",
             (self.game.SCREEN_WIDTH // 2, 150),
@@ -88,7 +98,10 @@ class SettingsScene:
             self.game.BRIGHT_GREEN,
             glow_size=pulse_size
         )
-        
+        return [title_rect]
+    
+    def draw_background(self, screen):
+        """Draw the parts of the scene that only change on setup (cached in dirty-rect mode)."""
         # Draw border box around title
         box_width = 350
         box_height = 80
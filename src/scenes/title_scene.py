@@ -2,6 +2,7 @@
 import pygame
 import pygame_gui
 from ..game_state import GameScene
+from ..matrix_rain import GlyphAtlas
 
 
 class TitleScene:
@@ -16,6 +17,7 @@ class TitleScene:
         self.show_text = True
         self.pulse_timer = 0
         self.scan_line_y = 0
+        self.rain_atlas = None
     
     def setup(self):
         """Initialize the title scene."""
@@ -153,10 +155,13 @@ class TitleScene:
         """Draw a simple Matrix rain effect in the background."""
         # Simplified - just draw some random characters
         import random
-        chars = "01"
-        for x in range(0, self.game.SCREEN_WIDTH, 20):
-            for y in range(0, self.game.SCREEN_HEIGHT, 40):
-                if random.random() < 0.1:
-                    char = random.choice(chars)
-                    char_surface = self.game.text_font.render(char, True, self.game.DARK_GREEN)
-                    screen.blit(char_surface, (x, y))
+        if self.rain_atlas is None:
+            self.rain_atlas = GlyphAtlas(self.game.text_font, "01", [self.game.DARK_GREEN])
+        glyphs = self.rain_atlas.glyphs[0]
+        cells = [(x, y) for x in range(0, self.game.SCREEN_WIDTH, 20)
+                 for y in range(0, self.game.SCREEN_HEIGHT, 40)]
+        count = int(len(cells) * 0.1 + random.random())
+        screen.blits(
+            [(random.choice(glyphs), cell) for cell in random.sample(cells, count)],
+            doreturn=False
+        )
@@ -0,0 +1,84 @@
+"""Word wrapping with cached layouts and pre-rendered lines."""
+from typing import List, Tuple
+
+import pygame
+
+from .eval_cache import LRUCache
+
+
+def wrap_text(text: str, font: pygame.font.Font, width: int) -> List[str]:
+    """
+    Break text into lines that fit within a pixel width.
+
+    Words are split on spaces and measured with font.size, which does not
+    render anything. A word wider than the line gets a line of its own.
+
+    Args:
+        text: Text to wrap
+        font: Font the text will be drawn with
+        width: Maximum line width in pixels
+
+    Returns:
+        The wrapped lines, without surrounding spaces
+    """
+    lines = []
+    current_line = ""
+    for word in text.split(' '):
+        test_line = current_line + word + " "
+        if font.size(test_line)[0] <= width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line.strip())
+            current_line = word + " "
+    if current_line:
+        lines.append(current_line.strip())
+    return lines
+
+
+class TextLayout:
+    """
+    Shared word-wrap engine for panels and overlays.
+
+    Wrapped line lists are cached per (text, font, width) and rendered lines
+    per (line, font, color), so static text such as a mission log costs
+    only blits once it has been drawn.
+    """
+
+    def __init__(self, layout_cache_size: int = 64, line_cache_size: int = 512):
+        self.layouts = LRUCache(layout_cache_size)
+        self.lines = LRUCache(line_cache_size)
+
+    def wrap(self, text: str, font: pygame.font.Font, width: int) -> Tuple[str, ...]:
+        """Get the wrapped lines for text (see wrap_text)."""
+        key = (text, font, width)
+        lines = self.layouts.get(key)
+        if lines is None:
+            lines = tuple(wrap_text(text, font, width))
+            self.layouts.put(key, lines)
+        return lines
+
+    def render_line(self, line: str, font: pygame.font.Font, color) -> pygame.Surface:
+        """Get a rendered surface for one line of text."""
+        color = tuple(color)
+        key = (line, font, color)
+        surface = self.lines.get(key)
+        if surface is None:
+            surface = font.render(line, True, color)
+            self.lines.put(key, surface)
+        return surface
+
+    def render(self, text: str, font: pygame.font.Font, color, width: int) -> List[pygame.Surface]:
+        """
+        Wrap text and get a rendered surface per line.
+
+        Args:
+            text: Text to wrap
+            font: Font to draw with
+            color: Text color
+            width: Maximum line width in pixels
+
+        Returns:
+            One surface per wrapped line, top to bottom
+        """
+        return [self.render_line(line, font, color) for line in self.wrap(text, font, width)]
@@ -0,0 +1,154 @@
+"""In-memory filesystem that backs open() inside the evaluation sandbox."""
+import base64
+import errno
+import io
+import posixpath
+from typing import Dict, List, Optional, Union
+
+# A level's requires_file: one fixture dict or a list of them
+FixtureSpec = Union[None, Dict, List[Dict]]
+
+
+class _VirtualFile(io.BytesIO):
+    """Byte buffer for one open file; writes are committed back on flush/close."""
+
+    def __init__(self, vfs, name: str, initial: bytes, readable: bool, writable: bool):
+        super().__init__(initial)
+        self.name = name
+        self._vfs = vfs
+        self._readable = readable
+        self._writable = writable
+
+    def readable(self) -> bool:
+        return self._readable
+
+    def writable(self) -> bool:
+        return self._writable
+
+    def _check_readable(self):
+        if not self._readable:
+            raise io.UnsupportedOperation("not readable")
+
+    def _check_writable(self):
+        if not self._writable:
+            raise io.UnsupportedOperation("not writable")
+
+    def read(self, size=-1):
+        self._check_readable()
+        return super().read(size)
+
+    def read1(self, size=-1):
+        self._check_readable()
+        return super().read1(size)
+
+    def readinto(self, buffer):
+        self._check_readable()
+        return super().readinto(buffer)
+
+    def readline(self, size=-1):
+        self._check_readable()
+        return super().readline(size)
+
+    def readlines(self, hint=-1):
+        self._check_readable()
+        return super().readlines(hint)
+
+    def write(self, data):
+        self._check_writable()
+        return super().write(data)
+
+    def writelines(self, lines):
+        self._check_writable()
+        return super().writelines(lines)
+
+    def truncate(self, size=None):
+        self._check_writable()
+        return super().truncate(size)
+
+    def flush(self):
+        super().flush()
+        if self._writable and not self.closed:
+            self._vfs.files[self.name] = self.getvalue()
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+class VirtualFileSystem:
+    """
+    Files for a single evaluation, kept entirely in memory.
+
+    Player code sees them through the `open` builtin injected into its
+    namespace, so nothing touches the disk and parallel runs can't see
+    each other's files.
+    """
+
+    def __init__(self, files: Optional[Dict[str, bytes]] = None):
+        self.files = dict(files) if files else {}
+
+    @classmethod
+    def from_fixtures(cls, fixtures: FixtureSpec) -> "VirtualFileSystem":
+        """
+        Build a filesystem from a level's requires_file entry.
+
+        Each fixture has 'filename' and 'content'; binary files set
+        "encoding": "base64" and give the content base64-encoded.
+        """
+        if not fixtures:
+            return cls()
+        if isinstance(fixtures, dict):
+            fixtures = [fixtures]
+
+        files = {}
+        for fixture in fixtures:
+            encoding = fixture.get("encoding", "utf-8")
+            content = fixture["content"]
+            if encoding == "base64":
+                data = base64.b64decode(content)
+            else:
+                data = content.encode(encoding)
+            files[cls._normalize(fixture["filename"])] = data
+        return cls(files)
+
+    @staticmethod
+    def _normalize(path) -> str:
+        """Map a path to its key, treating it as relative to the sandbox root."""
+        path = str(path).replace("\\", "/")
+        return posixpath.normpath(path).lstrip("/")
+
+    def open(self, file, mode="r", buffering=-1, encoding=None, errors=None,
+             newline=None, closefd=True, opener=None):
+        """Drop-in replacement for the open builtin."""
+        name = self._normalize(file)
+        kind = mode.replace("b", "").replace("t", "").replace("+", "")
+        if kind not in ("r", "w", "a", "x") or len(kind) != 1:
+            raise ValueError(f"invalid mode: '{mode}'")
+
+        plus = "+" in mode
+        if kind == "r":
+            if name not in self.files:
+                raise FileNotFoundError(errno.ENOENT, "No such file or directory", str(file))
+            initial = self.files[name]
+        elif kind == "x":
+            if name in self.files:
+                raise FileExistsError(errno.EEXIST, "File exists", str(file))
+            initial = b""
+        elif kind == "a":
+            initial = self.files.get(name, b"")
+        else:
+            initial = b""
+
+        handle = _VirtualFile(self, name, initial, readable=kind == "r" or plus,
+                              writable=kind != "r" or plus)
+        if kind == "a":
+            handle.seek(0, io.SEEK_END)
+        elif kind in ("w", "x"):
+            # Creating/truncating is visible immediately, like on disk
+            self.files[name] = b""
+
+        if "b" in mode:
+            return handle
+        return io.TextIOWrapper(handle, encoding=encoding or "utf-8", errors=errors,
+                                newline=newline, write_through=True)
@@ -0,0 +1,7 @@
+"""Validate every Mission: Pythonic level and self-test its solution (no pygame needed)."""
+import sys
+
+from src.level_validator import main
+
+if __name__ == "__main__":
+    sys.exit(main())